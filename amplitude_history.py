@@ -0,0 +1,182 @@
+"""
+Amplitude History - per-device (timestamp, amplitude) of every growl, kept in arrays
+allocated once at startup, so memory stays flat however long the server runs and however
+many belts report:
+  raw    - the last raw_samples growls per device
+  minute - per-minute rollups (count, mean/min/max amplitude) for the last minute_slots minutes
+  hour   - per-hour rollups for the last hour_slots hours
+Storage is flat typed arrays (array module; a few bytes per value, no per-sample objects).
+Rollups are rings indexed by minute/hour number, so recording a sample costs the same
+few array writes whatever the history length. Devices beyond max_devices take over the
+row of the belt that reported least recently.
+History lives in this process (one copy per worker).
+"""
+
+import math
+import threading
+from array import array
+from collections import OrderedDict
+
+NO_AMPLITUDE = 0xFFFF   # growls posted without an amplitude (ADC readings are 0..4095)
+RESOLUTIONS = {"minute": 60, "hour": 3600}
+
+
+def _zeros(typecode, n):
+    return array(typecode, bytes(array(typecode).itemsize * n))
+
+
+class Rollup:
+    """Ring of per-bucket aggregates for every device row (flat arrays, row-major)"""
+
+    def __init__(self, devices, slots, seconds):
+        self.slots = slots
+        self.seconds = seconds
+        n = devices * slots
+        self.bucket = array("q", [-1]) * n      # bucket number held by each slot
+        self.growls = _zeros("I", n)
+        self.amp_count = _zeros("I", n)
+        self.amp_sum = _zeros("I", n)
+        self.amp_min = _zeros("H", n)
+        self.amp_max = _zeros("H", n)
+
+    def add(self, row, ts, amplitude):
+        bucket = int(ts // self.seconds)
+        i = row * self.slots + bucket % self.slots
+        held = self.bucket[i]
+        if held > bucket:
+            return      # older than the ring reaches back
+        if held != bucket:
+            self.bucket[i] = bucket
+            self.growls[i] = self.amp_count[i] = self.amp_sum[i] = self.amp_max[i] = 0
+            self.amp_min[i] = NO_AMPLITUDE
+        self.growls[i] += 1
+        if amplitude != NO_AMPLITUDE:
+            self.amp_count[i] += 1
+            self.amp_sum[i] += amplitude
+            if amplitude < self.amp_min[i]:
+                self.amp_min[i] = amplitude
+            if amplitude > self.amp_max[i]:
+                self.amp_max[i] = amplitude
+
+    def reset(self, row):
+        start = row * self.slots
+        self.bucket[start:start + self.slots] = array("q", [-1]) * self.slots
+
+    def query(self, row, since, until):
+        start = row * self.slots
+        first = since // self.seconds
+        last = until // self.seconds if until != float("inf") else until    # inf // n is nan
+        held = sorted((b, start + k) for k, b in enumerate(self.bucket[start:start + self.slots])
+                      if b >= 0 and first <= b <= last)
+        points = []
+        for bucket, i in held:
+            count = self.amp_count[i]
+            points.append({
+                "ts": bucket * self.seconds,
+                "growls": self.growls[i],
+                "amplitude_mean": round(self.amp_sum[i] / count, 1) if count else None,
+                "amplitude_min": self.amp_min[i] if count else None,
+                "amplitude_max": self.amp_max[i] if count else None,
+            })
+        return points
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.bucket, self.growls, self.amp_count, self.amp_sum, self.amp_min, self.amp_max))
+
+
+class AmplitudeHistory:
+    def __init__(self, max_devices=256, raw_samples=1024, minute_slots=1440, hour_slots=720):
+        """
+        max_devices: device rows preallocated (least recently reporting device is reused beyond this)
+        raw_samples: newest growls kept per device at full resolution
+        minute_slots / hour_slots: how far back the minute (default 1 day) and hour (30 days) rollups go
+        """
+        self.max_devices = max_devices
+        self.raw_samples = raw_samples
+        self.raw_ts = _zeros("d", max_devices * raw_samples)
+        self.raw_amp = _zeros("H", max_devices * raw_samples)
+        self.raw_next = _zeros("q", max_devices)        # total samples written per row
+        self.rollups = {
+            "minute": Rollup(max_devices, minute_slots, RESOLUTIONS["minute"]),
+            "hour": Rollup(max_devices, hour_slots, RESOLUTIONS["hour"]),
+        }
+        self._rows = OrderedDict()      # device_id -> row, least recently reporting first
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    def _row(self, device_id):
+        row = self._rows.get(device_id)
+        if row is not None:
+            self._rows.move_to_end(device_id)
+            return row
+        if len(self._rows) < self.max_devices:
+            row = len(self._rows)
+        else:
+            _, row = self._rows.popitem(last=False)
+            self.evictions += 1
+            self.raw_next[row] = 0
+            for rollup in self.rollups.values():
+                rollup.reset(row)
+        self._rows[device_id] = row
+        return row
+
+    def record(self, device_id, ts, amplitude=None):
+        """One growl; amplitude is the belt's peak-to-peak reading (None if it didn't send one)"""
+        amplitude = amplitude if isinstance(amplitude, int) and 0 <= amplitude < NO_AMPLITUDE else NO_AMPLITUDE
+        if not isinstance(ts, (int, float)) or not math.isfinite(ts) or ts < 0:
+            self.rejected += 1      # checked before any write, so no row is left half-updated
+            return
+        with self._lock:
+            row = self._row(device_id)
+            i = row * self.raw_samples + self.raw_next[row] % self.raw_samples
+            self.raw_ts[i] = ts
+            self.raw_amp[i] = amplitude
+            self.raw_next[row] += 1
+            for rollup in self.rollups.values():
+                rollup.add(row, ts, amplitude)
+            self.samples += 1
+
+    def query(self, device_id, resolution="minute", since=0, until=float("inf"), limit=None):
+        """Growl history for one device, oldest first: raw samples or minute/hour rollups"""
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        with self._lock:
+            row = self._rows.get(device_id)
+            if row is None:
+                return []
+            if resolution == "raw":
+                written = self.raw_next[row]
+                start = row * self.raw_samples
+                samples = sorted(
+                    (self.raw_ts[start + p % self.raw_samples], self.raw_amp[start + p % self.raw_samples])
+                    for p in range(max(0, written - self.raw_samples), written)
+                )
+                points = [{"ts": round(t, 3), "amplitude": None if a == NO_AMPLITUDE else a}
+                          for t, a in samples if since <= t <= until]
+            elif resolution in self.rollups:
+                points = self.rollups[resolution].query(row, since, until)
+            else:
+                raise ValueError(f"resolution must be raw, {' or '.join(self.rollups)}")
+        return points[-limit:] if limit else points
+
+    def device_ids(self):
+        with self._lock:
+            return list(self._rows)
+
+    def nbytes(self):
+        return (sum(a.itemsize * len(a) for a in (self.raw_ts, self.raw_amp, self.raw_next))
+                + sum(r.nbytes() for r in self.rollups.values()))
+
+    def stats(self):
+        with self._lock:
+            devices = len(self._rows)
+        return {
+            "devices": devices,
+            "max_devices": self.max_devices,
+            "samples": self.samples,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "memory_mb": round(self.nbytes() / (1024 * 1024), 2),
+        }
@@ -1,161 +1,920 @@
-import os
-import time
-import json
-from flask import Flask, request, jsonify, render_template
-from anthropic import Anthropic
-from dotenv import load_dotenv
-
-load_dotenv()
-
-app = Flask(__name__)
-
-# Config
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "your_api_key_here")
-anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
-
-# State to track growls & Medical Data
-growl_events = []
-WINDOW_SIZE = 120 
-MIN_GROWLS_FOR_ORDER = 3 
-LAST_ORDER_TIME = 0
-MUTE_DURATION = 3600 
-
-# Default Medical Profile (Updated via /setup)
-USER_MEDICAL_PROFILE = {
-    "conditions": [], 
-    "critical_restrictions": [],
-    "health_goals": "Stay healthy"
-}
-
-def get_claude_recommendation(is_big_meal=False):
-    """
-    Claude acts as a Medical Nutritionist + Local Food Guide.
-    """
-    prompt = f"""
-    Internal State: User is hungry. 
-    Meal Size Request: {'Big' if is_big_meal else 'Small'}.
-    
-    PATIENT MEDICAL RECORD:
-    - Conditions: {', '.join(USER_MEDICAL_PROFILE['conditions'])}
-    - Restrictions: {', '.join(USER_MEDICAL_PROFILE['critical_restrictions'])}
-    - Goals: {USER_MEDICAL_PROFILE['health_goals']}
-    
-    MANAGEMENT RULES:
-    1. JOINT/LUNG HEALTH: Prioritize anti-inflammatory foods (Ginger, Turmeric, Omega-3s).
-    2. DIABETES: Strict Zero-Sugar. Max fiber. No white rice/maida.
-    3. BP/HEART: Zero deep-fry. Low salt. No processed meats.
-    4. OBESITY: Focus on nutrient density over calorie density.
-    
-    TASK: Recommend a specific dish from a Mangaluru restaurant that fits these strict medical needs.
-    Format your response as a JSON: {{"restaurant": "Name", "dish": "Dish Name", "rationale": "Medical Rationale"}}
-    """
-    
-    try:
-        message = anthropic.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=300,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return message.content[0].text
-    except Exception as e:
-        print(f"Error calling Claude: {e}")
-        return '{"restaurant": "Pabbas", "dish": "Gudbud", "rationale": "Fallback"}'
-
-def place_zomato_order(order_details):
-    """
-    Place order on Zomato
-    Set ENABLE_REAL_ORDERS=true in .env to use web automation
-    Otherwise uses mock/simulation mode
-    """
-    ENABLE_REAL_ORDERS = os.getenv("ENABLE_REAL_ORDERS", "false").lower() == "true"
-    PLATFORM = os.getenv("FOOD_PLATFORM", "zomato").lower()  # zomato or swiggy
-    USER_PHONE = os.getenv("USER_PHONE", "")
-    USER_LOCATION = os.getenv("USER_LOCATION", "Mangaluru")
-    
-    print(f"--- {PLATFORM.upper()} ORDER TRIGGERED ---")
-    print(f"ORDER: {order_details.get('dish')} from {order_details.get('restaurant')}")
-    print(f"RATIONALE: {order_details.get('rationale')}")
-    
-    if ENABLE_REAL_ORDERS and USER_PHONE:
-        print("🚀 REAL ORDER MODE ENABLED - Using Web Automation")
-        try:
-            if PLATFORM == "zomato":
-                from zomato_automation import ZomatoAutomation
-                bot = ZomatoAutomation(headless=False)
-                success = bot.auto_order(
-                    restaurant_name=order_details.get('restaurant'),
-                    dish_name=order_details.get('dish'),
-                    phone_number=USER_PHONE
-                )
-            elif PLATFORM == "swiggy":
-                from swiggy_automation import SwiggyAutomation
-                bot = SwiggyAutomation(headless=False)
-                success = bot.auto_order(
-                    restaurant_name=order_details.get('restaurant'),
-                    dish_name=order_details.get('dish'),
-                    phone_number=USER_PHONE,
-                    location=USER_LOCATION
-                )
-            else:
-                print(f"❌ Unknown platform: {PLATFORM}")
-                success = False
-            
-            if success:
-                print(f"--- ✅ REAL ORDER PLACED SUCCESSFULLY ---")
-            else:
-                print(f"--- ❌ ORDER FAILED ---")
-            return success
-            
-        except Exception as e:
-            print(f"❌ Automation error: {e}")
-            print("Falling back to mock mode...")
-    
-    # Mock mode (default)
-    print("📝 MOCK MODE - No real order placed (simulation only)")
-    print(f"--- ORDER SUCCESSFUL (SIMULATED) ---")
-    return True
-
-@app.route('/')
-def home():
-    return render_template('setup.html', profile=USER_MEDICAL_PROFILE)
-
-@app.route('/setup', methods=['POST'])
-def setup():
-    global USER_MEDICAL_PROFILE
-    USER_MEDICAL_PROFILE['conditions'] = request.form.getlist('conditions')
-    USER_MEDICAL_PROFILE['critical_restrictions'] = request.form.get('restrictions', '').split(',')
-    USER_MEDICAL_PROFILE['health_goals'] = request.form.get('goals', 'Healthy living')
-    return render_template('setup.html', status="Profile Saved Successfully!")
-
-@app.route('/detect', methods=['POST'])
-def detect_growl():
-    global growl_events, LAST_ORDER_TIME
-    current_time = time.time()
-    
-    if current_time - LAST_ORDER_TIME < MUTE_DURATION:
-        return jsonify({"status": "muted"}), 200
-
-    data = request.json
-    growl_events.append(current_time)
-    growl_events = [t for t in growl_events if current_time - t < WINDOW_SIZE]
-    
-    count = len(growl_events)
-    if count >= MIN_GROWLS_FOR_ORDER:
-        is_big_meal = count >= 5
-        recommendation_json = get_claude_recommendation(is_big_meal=is_big_meal)
-        
-        try:
-            order_details = json.loads(recommendation_json)
-        except:
-            order_details = {"restaurant": "Machali", "dish": "Fish Thali", "rationale": "Fallback"}
-
-        place_zomato_order(order_details)
-        LAST_ORDER_TIME = current_time
-        growl_events = []
-        
-        return jsonify({"status": "ordered", "order": order_details}), 200
-    
-    return jsonify({"status": "monitoring", "count": count}), 200
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+import os
+import math
+import time
+import json
+import threading
+import atexit
+import importlib
+import sys
+from startup import Startup
+from flask import Flask, request, jsonify, render_template
+from dotenv import load_dotenv
+from order_queue import OrderQueue, STAGES
+from recommendation_cache import RecommendationCache
+from device_state import DEFAULT_DEVICE_ID
+from device_config import DeviceConfigs
+from state_backend import open_state
+from browser_pool import BrowserPool
+from lean_mode import lean_enabled
+from platform_race import RaceEntrant, race, race_stats
+from speculation import SpeculativePrefetcher
+from growl_trace import TraceRecorder, read_trace
+from growl_classifier import GrowlClassifier
+from hunger_model import HungerModel, HungerPrewarmer
+from amplitude_history import AmplitudeHistory
+from menu_catalog import menu_catalog
+from claude_call import ClaudeCaller
+from single_flight import SingleFlight
+from metrics import metrics
+
+load_dotenv()
+
+app = Flask(__name__)
+
+# Config
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "your_api_key_here")
+anthropic = None    # Claude client, built on first use by get_anthropic()
+anthropic_lock = threading.Lock()
+
+# Cold-start bookkeeping: what's been built, how long it took, and whether /ready is 200.
+# WARMUP=true builds the order path in the background at startup instead of on the first order
+WARMUP = os.getenv("WARMUP", "true").lower() == "true"
+WARMUP_CONNECT = os.getenv("WARMUP_CONNECT", "true").lower() == "true"
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "120"))
+startup = Startup()
+
+# State to track growls & Medical Data
+WINDOW_SIZE = 120 
+MIN_GROWLS_FOR_ORDER = 3 
+MUTE_DURATION = 3600 
+MAX_BATCH_EVENTS = 500
+MAX_CLOCK_SKEW = 5      # seconds a batched event's ts may run ahead of the server clock
+MAX_FRAME_BYTES = 1024 * 1024   # ~65 s of 8 kHz audio per /detect/frames upload
+
+# One growl window + mute timer per device (keyed by "device_id" in the /detect body).
+# STATE_BACKEND=sqlite keeps windows, mutes, config overrides and the profile in STATE_DB_PATH so they
+# survive restarts and are shared by every worker process (e.g. gunicorn -w 4 'app:create_app()')
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory").lower()
+device_store, profile_store, override_store = open_state(
+    STATE_BACKEND, os.getenv("STATE_DB_PATH", "mom_state.db"), WINDOW_SIZE, MIN_GROWLS_FOR_ORDER, MUTE_DURATION
+)
+
+# What each belt should run with, served at /devices/<id>/config (ETag + long-poll).
+# The DEVICE_* values are the firmware's defaults; PUT /devices/<id>/config retunes one belt
+device_configs = DeviceConfigs(device_store, {
+    "threshold": int(os.getenv("DEVICE_THRESHOLD", "2500")),
+    "min_growl_duration_ms": int(os.getenv("DEVICE_MIN_GROWL_MS", "1500")),
+    "snapshot_ms": int(os.getenv("DEVICE_SNAPSHOT_MS", "50")),
+    "cooldown_ms": int(os.getenv("DEVICE_COOLDOWN_MS", "60000")),
+}, recheck=None if STATE_BACKEND == "memory" else 1.0, saved=override_store)
+MAX_CONFIG_WAIT = float(os.getenv("MAX_CONFIG_WAIT", "60"))
+
+# Optional trace of every /detect event for offline replay (see replay_trace.py)
+TRACE_FILE = os.getenv("TRACE_FILE", "")
+trace_recorder = TraceRecorder(TRACE_FILE) if TRACE_FILE else None
+if trace_recorder:
+    atexit.register(trace_recorder.flush)
+
+# Every growl's (timestamp, amplitude) per belt, in fixed-size arrays (/devices/<id>/history)
+amplitude_history = AmplitudeHistory(
+    max_devices=int(os.getenv("HISTORY_MAX_DEVICES", "256")),
+    raw_samples=int(os.getenv("HISTORY_RAW_SAMPLES", "1024")),
+    minute_slots=int(os.getenv("HISTORY_MINUTES", "1440")),
+    hour_slots=int(os.getenv("HISTORY_HOURS", "720"))
+)
+
+# Server-side classifier for raw ADC audio posted to /detect/frames
+growl_classifier = GrowlClassifier(
+    sample_rate=int(os.getenv("ADC_SAMPLE_RATE", "8000")),
+    frame_size=int(os.getenv("ADC_FRAME_SIZE", "400")),
+    p2p_threshold=int(os.getenv("GROWL_P2P_THRESHOLD", "2500")),
+    rms_threshold=float(os.getenv("GROWL_RMS_THRESHOLD", "400")),
+    min_band_ratio=float(os.getenv("GROWL_BAND_RATIO", "0.5")),
+    min_duration=float(os.getenv("GROWL_MIN_DURATION", "1.5"))
+)
+
+# Default Medical Profile (Updated via /setup)
+USER_MEDICAL_PROFILE = {
+    "conditions": [], 
+    "critical_restrictions": [],
+    "health_goals": "Stay healthy"
+}
+USER_MEDICAL_PROFILE.update(profile_store.load() or {})
+
+FALLBACK_RECOMMENDATION = '{"restaurant": "Pabbas", "dish": "Gudbud", "rationale": "Fallback", "source": "fallback"}'
+
+# Local medically-tagged menu (menu_catalog.json) consulted before Claude:
+#   rerank - Claude picks from the catalogue dishes that fit the profile (full prompt only if none fit)
+#   local  - use the best catalogue dish without calling Claude
+#   claude - always ask Claude the open question
+# In every mode the catalogue supplies a profile-respecting pick when the API fails.
+MENU_MODE = os.getenv("MENU_MODE", "rerank").lower()
+MENU_SHORTLIST = int(os.getenv("MENU_SHORTLIST", "5"))
+
+# Cached Claude picks per (profile, meal size); RECOMMENDATION_VARIETY > 1 rotates dishes
+recommendation_cache = RecommendationCache(
+    ttl=int(os.getenv("RECOMMENDATION_TTL", "21600")),
+    max_entries=int(os.getenv("RECOMMENDATION_CACHE_SIZE", "256")),
+    variety=int(os.getenv("RECOMMENDATION_VARIETY", "1"))
+)
+recommendation_flights = SingleFlight()
+
+# Static part of every request - identical bytes each call, so it is marked as a cached prefix.
+# The API only caches a prefix (tools + system) of at least 1024 tokens on Sonnet; this one is
+# a few hundred, so until it grows cache_control is a no-op and /metrics shows no cache reads
+SYSTEM_PROMPT = """You are a Medical Nutritionist and Local Food Guide for Mangaluru.
+The user wears a belt that detected stomach growls; pick one restaurant dish for them to order now.
+
+MANAGEMENT RULES:
+1. JOINT/LUNG HEALTH: Prioritize anti-inflammatory foods (Ginger, Turmeric, Omega-3s).
+2. DIABETES: Strict Zero-Sugar. Max fiber. No white rice/maida.
+3. BP/HEART: Zero deep-fry. Low salt. No processed meats.
+4. OBESITY: Focus on nutrient density over calorie density.
+
+Never break a listed restriction. Answer only by calling the recommend_meal tool."""
+
+RECOMMENDATION_TOOL = {
+    "name": "recommend_meal",
+    "description": "Order this dish for the patient.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "restaurant": {"type": "string", "description": "Restaurant name, exactly as listed if options were given"},
+            "dish": {"type": "string", "description": "Dish name, exactly as listed if options were given"},
+            "rationale": {"type": "string", "description": "One-sentence medical rationale"}
+        },
+        "required": ["restaurant", "dish", "rationale"]
+    }
+}
+
+CLAUDE_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022")
+
+# Hard deadline per recommendation; a hedge request is sent if the first is slow
+claude_caller = ClaudeCaller(
+    deadline=float(os.getenv("CLAUDE_DEADLINE", "12")),
+    hedge_after=float(os.getenv("CLAUDE_HEDGE_AFTER", "4")),
+    max_attempts=int(os.getenv("CLAUDE_MAX_ATTEMPTS", "3")),
+    concurrency=int(os.getenv("CLAUDE_CONCURRENCY", "16"))
+)
+
+def get_anthropic():
+    """The Claude client, built on first use (importing anthropic alone takes ~2 s)"""
+    global anthropic
+    if anthropic is None:
+        with anthropic_lock:
+            if anthropic is None:
+                with startup.timed("claude_client"):
+                    from anthropic import Anthropic
+                    anthropic = Anthropic(api_key=ANTHROPIC_API_KEY)
+    return anthropic
+
+def connect_claude():
+    """Open the HTTPS connection to the API ahead of the first order (listing models costs no tokens)"""
+    from anthropic import APIStatusError
+    try:
+        get_anthropic().with_options(max_retries=0, timeout=10).models.list(limit=1)
+    except APIStatusError:
+        pass    # the API answered, so the kept-alive connection is there either way
+
+def send_claude_request(**request):
+    """Blocking transport for Claude requests; async_app.py swaps in its event-loop client"""
+    return claude_caller.create(get_anthropic(), **request)
+
+def recommendation_from_message(message):
+    """The recommend_meal tool input as a JSON string (schema-checked by the API)"""
+    for block in message.content:
+        if getattr(block, "type", None) == "tool_use" and block.name == RECOMMENDATION_TOOL["name"]:
+            return json.dumps(block.input)
+    raise ValueError("Claude answered without calling recommend_meal")
+
+def record_usage(message):
+    usage = getattr(message, "usage", None)
+    if usage is None:
+        return
+    for field in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+        metrics.inc(f"claude_{field}", getattr(usage, field, None) or 0)
+
+def get_claude_recommendation(is_big_meal=False, profile=None):
+    """
+    Claude acts as a Medical Nutritionist + Local Food Guide.
+    """
+    if profile is None:
+        profile = USER_MEDICAL_PROFILE
+    shortlist = menu_catalog.match(profile, is_big_meal, limit=MENU_SHORTLIST) if MENU_MODE != "claude" else []
+    if shortlist and MENU_MODE == "local":
+        metrics.inc("menu_local_picks")
+        return menu_catalog.recommendation(profile, is_big_meal)
+
+    if shortlist:
+        options = "\n".join(f"- {d['restaurant']} | {d['dish']} ({d.get('notes', '')})" for d in shortlist)
+        task = f"These local dishes avoid every restriction above. Pick the best one for this patient:\n{options}"
+    else:
+        task = "Recommend a specific dish from a Mangaluru restaurant that fits these strict medical needs."
+    prompt = f"""Meal Size Request: {'Big' if is_big_meal else 'Small'}.
+
+PATIENT MEDICAL RECORD:
+- Conditions: {', '.join(profile['conditions'])}
+- Restrictions: {', '.join(profile['critical_restrictions'])}
+- Goals: {profile['health_goals']}
+
+{task}"""
+
+    try:
+        with metrics.timer("claude_call"):
+            message = send_claude_request(
+                model=CLAUDE_MODEL,
+                max_tokens=300,
+                system=[{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+                tools=[RECOMMENDATION_TOOL],
+                tool_choice={"type": "tool", "name": RECOMMENDATION_TOOL["name"]},
+                messages=[{"role": "user", "content": prompt}]
+            )
+        metrics.inc("claude_calls")
+        record_usage(message)
+        text = recommendation_from_message(message)
+    except Exception as e:
+        print(f"Error calling Claude: {e}")
+        metrics.inc("claude_fallbacks")
+        return offline_recommendation(is_big_meal, profile)
+
+    if shortlist:
+        # Re-ranking may only choose from the profile-safe shortlist
+        choice = json.loads(text)
+        picked = (str(choice.get("restaurant", "")).strip().lower(), str(choice.get("dish", "")).strip().lower())
+        if any((d["restaurant"].lower(), d["dish"].lower()) == picked for d in shortlist):
+            return text
+        print("⚠️ Claude picked outside the shortlist; using the top catalogue match")
+        metrics.inc("menu_rerank_rejected")
+        return menu_catalog.recommendation(profile, is_big_meal)
+    return text
+
+def offline_recommendation(is_big_meal=False, profile=None):
+    """Best catalogue dish for the profile when Claude is unavailable; fixed fallback if nothing fits"""
+    return menu_catalog.recommendation(profile or USER_MEDICAL_PROFILE, is_big_meal, source="fallback") \
+        or FALLBACK_RECOMMENDATION
+
+def fill_recommendation_cache(is_big_meal, profile):
+    """Fetch one recommendation from Claude and store it; concurrent misses share one call"""
+    key = recommendation_cache.key(profile, is_big_meal)
+    return recommendation_flights.do(key, fetch_recommendation, key, is_big_meal, profile)
+
+def fetch_recommendation(key, is_big_meal, profile):
+    recommendation_json = get_claude_recommendation(is_big_meal=is_big_meal, profile=profile)
+    try:
+        # Fallback picks are not cached so the next trigger retries Claude
+        if json.loads(recommendation_json).get("source") != "fallback":
+            recommendation_cache.put(key, recommendation_json)
+    except (ValueError, AttributeError):
+        pass
+    return recommendation_json
+
+def prewarm_recommendations(profile=None, sizes=(False, True)):
+    """Fill the cache for both meal sizes on a background thread"""
+    snapshot = json.loads(json.dumps(profile or USER_MEDICAL_PROFILE))
+
+    def warm():
+        for is_big_meal in sizes:
+            key = recommendation_cache.key(snapshot, is_big_meal)
+            for _ in range(recommendation_cache.variety):
+                if not recommendation_cache.wants_more(key) or recommendation_flights.in_flight(key):
+                    break
+                fill_recommendation_cache(is_big_meal, snapshot)
+
+    threading.Thread(target=warm, name="recommendation-prewarm", daemon=True).start()
+
+def sync_profile():
+    """Pick up a profile another worker process saved through /setup"""
+    stored = profile_store.changed()
+    if stored is not None:
+        USER_MEDICAL_PROFILE.update(stored)
+        recommendation_cache.invalidate()
+        prefetcher.discard()
+
+def get_recommendation(is_big_meal=False):
+    """Cached front for get_claude_recommendation; only misses wait on the API"""
+    sync_profile()
+    key = recommendation_cache.key(USER_MEDICAL_PROFILE, is_big_meal)
+    cached = recommendation_cache.get(key)
+    if cached is not None:
+        if recommendation_cache.wants_more(key):
+            prewarm_recommendations(sizes=(is_big_meal,))
+        return cached
+    return fill_recommendation_cache(is_big_meal, json.loads(json.dumps(USER_MEDICAL_PROFILE)))
+
+# Warm Chrome sessions per platform, created on first real order
+browser_pools = {}
+browser_pools_lock = threading.Lock()
+
+# Platform -> (module, class). Each is a selector table for the shared flow in platform_driver.py
+BOT_CLASSES = {
+    "zomato": ("zomato_automation", "ZomatoAutomation"),
+    "swiggy": ("swiggy_automation", "SwiggyAutomation"),
+}
+
+def bot_class(platform):
+    if platform not in BOT_CLASSES:
+        raise ValueError(f"Unknown platform: {platform}")
+    module, name = BOT_CLASSES[platform]
+    if module not in sys.modules:
+        with startup.timed("order_modules"):     # selenium + the flow engine, ~0.3 s the first time
+            importlib.import_module(module)
+    return getattr(sys.modules[module], name)
+
+def get_browser_pool(platform):
+    """Return the shared BrowserPool for zomato/swiggy"""
+    with browser_pools_lock:
+        pool = browser_pools.get(platform)
+        if pool is None:
+            bot = bot_class(platform)
+            headless = os.getenv("BROWSER_HEADLESS", "false").lower() == "true"
+            lean = lean_enabled(platform)
+            pool = BrowserPool(
+                lambda: bot.create_driver(headless, lean),
+                platform,
+                lean=lean,
+                size=int(os.getenv("BROWSER_POOL_SIZE", "1")),
+                max_uses=int(os.getenv("BROWSER_POOL_MAX_USES", "20")),
+                max_memory_mb=int(os.getenv("BROWSER_POOL_MAX_MB", "2048"))
+            )
+            browser_pools[platform] = pool
+        return pool
+
+def order_platforms():
+    platform = os.getenv("FOOD_PLATFORM", "zomato").lower()
+    return ("zomato", "swiggy") if platform == "race" else (platform,)
+
+def warm_order_browser(device_id):
+    """Check out and log in the order's browser(s) ahead of a predicted order; None in mock mode"""
+    phone = os.getenv("USER_PHONE", "")
+    if os.getenv("ENABLE_REAL_ORDERS", "false").lower() != "true" or not phone:
+        return None
+    sessions = []
+    try:
+        for platform in order_platforms():
+            sessions.append(get_browser_pool(platform).checkout())
+            if not bot_class(platform)(driver=sessions[-1].driver).login(phone):
+                raise RuntimeError(f"{platform} login failed")
+    except Exception:
+        release_order_browser(sessions, used=False)
+        raise
+    print(f"🔥 Browser ready and logged in ahead of {device_id}'s usual mealtime")
+    return sessions
+
+def real_orders_enabled():
+    return os.getenv("ENABLE_REAL_ORDERS", "false").lower() == "true"
+
+def browsers_ready():
+    """Every order platform has launched a browser"""
+    return all(name in browser_pools and browser_pools[name].launched for name in order_platforms())
+
+def prelaunch_browsers():
+    prewarm_browser_pools()
+    deadline = time.time() + WARMUP_TIMEOUT
+    while not browsers_ready():
+        if time.time() > deadline:
+            raise TimeoutError(f"no browser up after {WARMUP_TIMEOUT:.0f}s")
+        time.sleep(0.1)
+
+# Warmup order: what the first order would otherwise build on its own critical path
+startup.step("claude_client", get_anthropic, check=lambda: anthropic is not None)
+startup.step("claude_connection", connect_claude, required=False, enabled=lambda: WARMUP_CONNECT)
+startup.step("order_modules", lambda: [bot_class(name) for name in order_platforms()],
+             check=lambda: all(BOT_CLASSES[name][0] in sys.modules for name in order_platforms()),
+             enabled=real_orders_enabled)
+startup.step("browsers", prelaunch_browsers, check=browsers_ready,
+             enabled=lambda: real_orders_enabled() and os.getenv("BROWSER_POOL_PREWARM", "true").lower() == "true")
+
+def release_order_browser(sessions, used):
+    """used: hand the logged-in session back to the pool for the order; else close it"""
+    for session in sessions:
+        get_browser_pool(session.platform).release(session, broken=not used)
+
+def race_order(order_details, phone, location, on_stage):
+    """Drive Zomato and Swiggy side by side and commit whichever reaches checkout first"""
+    # Both bots report stages; only pass on forward progress
+    progress = {"index": STAGES.index("browser")}
+    progress_lock = threading.Lock()
+    def forward(stage):
+        with progress_lock:
+            if STAGES.index(stage) <= progress["index"]:
+                return
+            progress["index"] = STAGES.index(stage)
+        on_stage(stage)
+
+    restaurant = order_details.get('restaurant')
+    dish = order_details.get('dish')
+    sessions = []
+    try:
+        for platform in ("zomato", "swiggy"):
+            sessions.append(get_browser_pool(platform).checkout())
+        bots = [bot_class(session.platform)(driver=session.driver) for session in sessions]
+    except Exception:
+        for session in sessions:
+            get_browser_pool(session.platform).release(session)
+        raise
+    # A losing bot may still be unwinding when the winner has paid; it releases its own browser
+    entrants = [
+        RaceEntrant(
+            session.platform,
+            metrics.bind(lambda bot=bot: bot.auto_order(restaurant, dish, phone, location=location, on_stage=forward, commit=False)),
+            bot.commit_order,
+            bot.cancel,
+            release=lambda session=session: get_browser_pool(session.platform).release(session)
+        )
+        for bot, session in zip(bots, sessions)
+    ]
+    winner, success = race(entrants, timeout=float(os.getenv("RACE_TIMEOUT", "300")))
+    if winner:
+        print(f"--- {winner.upper()} WON THE RACE ---")
+    return success
+
+def place_zomato_order(order_details, on_stage=None):
+    """
+    Place order on Zomato
+    Set ENABLE_REAL_ORDERS=true in .env to use web automation
+    Otherwise uses mock/simulation mode
+    on_stage: optional callback(stage) to report browser/cart/checkout progress
+    """
+    if on_stage is None:
+        on_stage = lambda stage: None
+
+    ENABLE_REAL_ORDERS = os.getenv("ENABLE_REAL_ORDERS", "false").lower() == "true"
+    PLATFORM = os.getenv("FOOD_PLATFORM", "zomato").lower()  # zomato, swiggy or race
+    USER_PHONE = os.getenv("USER_PHONE", "")
+    USER_LOCATION = os.getenv("USER_LOCATION", "Mangaluru")
+    
+    print(f"--- {PLATFORM.upper()} ORDER TRIGGERED ---")
+    print(f"ORDER: {order_details.get('dish')} from {order_details.get('restaurant')}")
+    print(f"RATIONALE: {order_details.get('rationale')}")
+    
+    if ENABLE_REAL_ORDERS and USER_PHONE:
+        print("🚀 REAL ORDER MODE ENABLED - Using Web Automation")
+        on_stage("browser")
+        try:
+            if PLATFORM in BOT_CLASSES:
+                with get_browser_pool(PLATFORM).session() as session:
+                    bot = bot_class(PLATFORM)(driver=session.driver)
+                    success = bot.auto_order(
+                        restaurant_name=order_details.get('restaurant'),
+                        dish_name=order_details.get('dish'),
+                        phone_number=USER_PHONE,
+                        location=USER_LOCATION,
+                        on_stage=on_stage
+                    )
+            elif PLATFORM == "race":
+                success = race_order(order_details, USER_PHONE, USER_LOCATION, on_stage)
+            else:
+                print(f"❌ Unknown platform: {PLATFORM}")
+                success = False
+            
+            if success:
+                print(f"--- ✅ REAL ORDER PLACED SUCCESSFULLY ---")
+            else:
+                print(f"--- ❌ ORDER FAILED ---")
+            return success
+            
+        except Exception as e:
+            print(f"❌ Automation error: {e}")
+            print("Falling back to mock mode...")
+    
+    # Mock mode (default)
+    for stage in ("browser", "cart", "checkout"):
+        on_stage(stage)
+    print("📝 MOCK MODE - No real order placed (simulation only)")
+    print(f"--- ORDER SUCCESSFUL (SIMULATED) ---")
+    return True
+
+def parse_recommendation(recommendation_json, is_big_meal=False):
+    try:
+        return json.loads(recommendation_json)
+    except (TypeError, ValueError):
+        metrics.inc("recommendation_parse_failures")
+        return json.loads(offline_recommendation(is_big_meal))
+
+def run_order_job(job):
+    """Worker-side pipeline: recommend -> browser -> cart -> checkout"""
+    with metrics.order_trace(job.id, started_at=job.created_at):
+        metrics.observe("order_queue_wait", time.time() - job.created_at, start=job.created_at)
+        with metrics.timer("order_total"):
+            job.set_stage("recommend")
+            with metrics.timer("recommend"):
+                recommendation_json = None
+                prefetched = job.payload.get("prefetched")
+                if prefetched is not None:
+                    try:
+                        recommendation_json = prefetched.result(timeout=60)
+                    except Exception as e:
+                        print(f"⚠️ Speculative recommendation failed: {e}")
+                if recommendation_json is None:
+                    recommendation_json = get_recommendation(is_big_meal=job.payload.get("is_big_meal", False))
+                job.order = parse_recommendation(recommendation_json, job.payload.get("is_big_meal", False))
+            success = place_zomato_order(job.order, on_stage=job.set_stage)
+        metrics.inc("orders_succeeded" if success else "orders_failed")
+        return success
+
+order_queue = OrderQueue(run_order_job, workers=int(os.getenv("ORDER_WORKERS", "2")))
+
+# One in-flight order per device, or per user (every belt feeds the same profile).
+# Coalescing is per process: with several workers each can still place its own order
+ORDER_COALESCE = os.getenv("ORDER_COALESCE", "device").lower()
+
+# Start the recommendation when a device is one growl short of ordering
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "true").lower() == "true"
+prefetcher = SpeculativePrefetcher(
+    lambda is_big_meal: get_recommendation(is_big_meal=is_big_meal),
+    workers=int(os.getenv("SPECULATION_WORKERS", "4"))
+)
+
+# Learn each belt's usual mealtimes and get the order path ready shortly before them
+HUNGER_PREWARM = os.getenv("HUNGER_PREWARM", "true").lower() == "true"
+hunger_model = HungerModel(
+    slot_minutes=int(os.getenv("HUNGER_SLOT_MINUTES", "30")),
+    half_life_days=float(os.getenv("HUNGER_HALF_LIFE_DAYS", "14"))
+)
+hunger_prewarmer = HungerPrewarmer(
+    hunger_model,
+    warm=warm_order_browser,
+    release=release_order_browser,
+    precompute=lambda: get_recommendation(is_big_meal=False),
+    lead=float(os.getenv("HUNGER_LEAD", "600")),
+    min_score=float(os.getenv("HUNGER_MIN_SCORE", "0.3"))
+)
+if HUNGER_PREWARM and TRACE_FILE and os.path.exists(TRACE_FILE):
+    # Past growls recorded by TRACE_FILE are the history the model starts from
+    learned = hunger_model.learn_trace(read_trace(TRACE_FILE), WINDOW_SIZE, MIN_GROWLS_FOR_ORDER, MUTE_DURATION)
+    print(f"🔮 Learned mealtimes from {learned} recorded growls")
+
+@app.route('/')
+def home():
+    sync_profile()
+    return render_template('setup.html', profile=USER_MEDICAL_PROFILE)
+
+@app.route('/setup', methods=['POST'])
+def setup():
+    save_profile(request.form.getlist('conditions'), request.form.get('restrictions', ''), request.form.get('goals', 'Healthy living'))
+    return render_template('setup.html', status="Profile Saved Successfully!")
+
+def save_profile(conditions, restrictions, goals):
+    """Store a new medical profile and re-warm recommendations for it"""
+    USER_MEDICAL_PROFILE['conditions'] = conditions
+    USER_MEDICAL_PROFILE['critical_restrictions'] = restrictions.split(',')
+    USER_MEDICAL_PROFILE['health_goals'] = goals
+    profile_store.save(USER_MEDICAL_PROFILE)
+    recommendation_cache.invalidate()
+    prefetcher.discard()
+    prewarm_recommendations()
+
+def start_order(device_id, count):
+    """Queue an order for a device that just crossed the growl threshold"""
+    is_big_meal = count >= 5
+    now = device_store.clock()
+    prefetched = prefetcher.take(device_id, is_big_meal, now)
+    hunger_prewarmer.order_started(device_id, now)
+    hunger_model.observe(device_id, now, "order")
+    # Triggers arriving while an order is in flight join it and get its order_id
+    key = f"device:{device_id}" if ORDER_COALESCE == "device" else "user"
+    device_configs.changed(device_id)   # the belt is muted now - tell its config long-poll
+    return order_queue.submit(key=key, is_big_meal=is_big_meal, growl_count=count, device_id=device_id, prefetched=prefetched)
+
+def maybe_speculate(device_id, result):
+    """Start the recommendation early when the device is one growl short of ordering"""
+    if SPECULATIVE_PREFETCH and result["count"] == MIN_GROWLS_FOR_ORDER - 1:
+        now = device_store.clock()
+        prefetcher.expire(now)
+        prefetcher.maybe_start(device_id, MIN_GROWLS_FOR_ORDER >= 5, result["window_expires_at"], now)
+
+@app.route('/detect', methods=['POST'])
+@metrics.timed("detect")
+def detect_growl():
+    body, status = handle_detect(request.get_json(silent=True) or {})
+    return jsonify(body), status
+
+def handle_detect(data):
+    """One growl from a belt -> (response body, HTTP status); shared by the Flask and ASGI servers"""
+    if not isinstance(data, dict):
+        data = {}
+    device_id = str(data.get("device_id") or DEFAULT_DEVICE_ID)
+    amplitude = data.get("amplitude")
+    amplitude_history.record(device_id, device_store.clock(), amplitude)
+
+    if trace_recorder:
+        trace_recorder.record(device_id, device_store.clock(), amplitude if isinstance(amplitude, int) else None)
+
+    # Mute check, window update and trigger all happen under the device's own lock
+    result = device_store.record_growl(device_id)
+    metrics.inc(f"detect_{result['status']}")
+    if result["status"] != "muted":
+        hunger_model.observe(device_id, device_store.clock())
+    
+    if result["status"] == "muted":
+        return {"status": "muted", "device_id": device_id, "muted_until": result["muted_until"],
+                "mute_remaining_s": round(max(0, result["muted_until"] - device_store.clock()), 1)}, 200
+
+    count = result["count"]
+    if result["status"] == "triggered":
+        job = start_order(device_id, count)
+        return {"status": "accepted", "device_id": device_id, "order_id": job.id, "status_url": f"/orders/{job.id}"}, 202
+    
+    maybe_speculate(device_id, result)
+    return {"status": "monitoring", "device_id": device_id, "count": count}, 200
+
+def apply_events(device_id, parsed):
+    """Run (event_id, timestamp, amplitude) growls through the device's window; returns (results, order_ids)"""
+    results = device_store.record_batch(device_id, [(event_id, timestamp) for event_id, timestamp, _ in parsed])
+
+    # Results come back in timestamp order
+    ordered = sorted(parsed, key=lambda e: e[1])
+    for (event_id, timestamp, amplitude), result in zip(ordered, results):
+        if result["status"] != "duplicate":
+            amplitude_history.record(device_id, timestamp, amplitude)
+            if trace_recorder:
+                trace_recorder.record(device_id, timestamp, amplitude if isinstance(amplitude, int) else None)
+
+    order_ids = []
+    for event, result in zip(ordered, results):
+        metrics.inc(f"detect_{result['status']}")
+        if result["status"] not in ("muted", "duplicate"):
+            hunger_model.observe(device_id, event[1])
+        if result["status"] == "triggered":
+            order_ids.append(start_order(device_id, result["count"]).id)
+    applied = [r for r in results if r["status"] != "duplicate"]
+    if applied and applied[-1]["status"] == "monitoring":
+        maybe_speculate(device_id, applied[-1])
+    return results, order_ids
+
+@app.route('/detect/batch', methods=['POST'])
+@metrics.timed("detect_batch")
+def detect_batch():
+    body, status = handle_batch(request.get_json(silent=True) or {})
+    return jsonify(body), status
+
+def growl_time_ok(timestamp, now):
+    """Within the growl window, at most MAX_CLOCK_SKEW s ahead (nan/inf or future times would never leave it)"""
+    return now - WINDOW_SIZE <= timestamp <= now + MAX_CLOCK_SKEW
+
+def handle_batch(data):
+    """
+    Apply many growls from one device in one request.
+    Body: {"device_id": "...", "events": [{"id": "...", "ts": epoch_s | "age_ms": ms_ago, "amplitude": N}, ...]}
+    Event ids make retries safe: an id already applied is reported as "duplicate" and skipped.
+    Events whose time isn't within the growl window (up to MAX_CLOCK_SKEW s ahead) are "rejected".
+    """
+    if not isinstance(data, dict):
+        data = {}
+    device_id = str(data.get("device_id") or DEFAULT_DEVICE_ID)
+    events = data.get("events")
+    if not isinstance(events, list):
+        return {"status": "error", "error": "events must be a list"}, 400
+    if len(events) > MAX_BATCH_EVENTS:
+        return {"status": "error", "error": f"at most {MAX_BATCH_EVENTS} events per batch"}, 413
+
+    now = device_store.clock()
+    parsed, rejected = [], []
+    try:
+        for event in events:
+            event_id = event.get("id")
+            event_id = None if event_id is None else str(event_id)
+            if "ts" in event:
+                timestamp = float(event["ts"])
+            else:
+                age_ms = float(event.get("age_ms", 0))
+                timestamp = now - age_ms / 1000 if age_ms >= 0 else math.nan
+            if not growl_time_ok(timestamp, now):
+                rejected.append(event_id)
+                continue
+            parsed.append((event_id, timestamp, event.get("amplitude")))
+    except (TypeError, ValueError, AttributeError):
+        return {"status": "error", "error": "each event needs a numeric ts or age_ms"}, 400
+
+    results, order_ids = apply_events(device_id, parsed) if parsed else ([], [])
+    applied = [r for r in results if r["status"] != "duplicate"]
+    metrics.inc("detect_rejected", len(rejected))
+    return {
+        "status": "accepted" if order_ids else "ok",
+        "device_id": device_id,
+        "applied": len(applied),
+        "duplicates": len(results) - len(applied),
+        "rejected": len(rejected),
+        "order_ids": order_ids,
+        "results": [{"id": r["event_id"], "status": r["status"]} for r in results]
+                   + [{"id": event_id, "status": "rejected"} for event_id in rejected],
+        "state": device_store.snapshot(device_id),
+    }, 202 if order_ids else 200
+
+@app.route('/detect/frames', methods=['POST'])
+@metrics.timed("detect_frames")
+def detect_frames():
+    """
+    Classify raw microphone audio on the server instead of trusting the belt's threshold.
+    Body: little-endian uint16 ADC samples (application/octet-stream), oldest first
+    Query: device_id, rate (Hz), frame (samples per frame), age_ms (how long ago the last sample was taken)
+    """
+    device_id = str(request.args.get("device_id") or request.headers.get("X-Device-Id") or DEFAULT_DEVICE_ID)
+    # Content-Length first, then the bytes actually read (chunked uploads have no length)
+    audio = b"" if (request.content_length or 0) > MAX_FRAME_BYTES else request.stream.read(MAX_FRAME_BYTES + 1)
+    if (request.content_length or 0) > MAX_FRAME_BYTES or len(audio) > MAX_FRAME_BYTES:
+        return jsonify({"status": "error", "error": f"at most {MAX_FRAME_BYTES} bytes per upload"}), 413
+    body, status = handle_frames(device_id, request.args, audio)
+    return jsonify(body), status
+
+def handle_frames(device_id, args, body):
+    """Classify one /detect/frames upload; args holds the rate/frame/age_ms query parameters"""
+    try:
+        sample_rate = int(args.get("rate", growl_classifier.sample_rate))
+        frame_size = int(args.get("frame", growl_classifier.frame_size))
+        age_ms = float(args.get("age_ms", 0))
+    except ValueError:
+        return {"status": "error", "error": "rate, frame and age_ms must be numbers"}, 400
+    if sample_rate <= 0 or frame_size <= 1:
+        return {"status": "error", "error": "rate and frame must be positive"}, 400
+    if not math.isfinite(age_ms) or age_ms < 0:
+        return {"status": "error", "error": "age_ms must be a finite, non-negative number"}, 400
+
+    now = device_store.clock()
+    events, frames, growl_frames = growl_classifier.classify(device_id, body, now - age_ms / 1000, sample_rate, frame_size)
+    metrics.inc("adc_frames", frames)
+    # Same window check as /detect/batch (a huge age_ms puts every growl out of it)
+    rejected = [e for e in events if not growl_time_ok(e["ts"], now)]
+    events = [e for e in events if growl_time_ok(e["ts"], now)]
+    metrics.inc("detect_rejected", len(rejected))
+
+    results, order_ids = [], []
+    if events:
+        results, order_ids = apply_events(device_id, [(None, e["ts"], e["amplitude"]) for e in events])
+
+    return {
+        "status": "accepted" if order_ids else "ok",
+        "device_id": device_id,
+        "frames": frames,
+        "growl_frames": growl_frames,
+        "growls": [dict(e, status=r["status"]) for e, r in zip(events, results)]
+                  + [dict(e, status="rejected") for e in rejected],
+        "order_ids": order_ids,
+        "state": device_store.snapshot(device_id),
+    }, 202 if order_ids else 200
+
+@app.route('/devices/<device_id>/config', methods=['GET'])
+def device_config(device_id):
+    """
+    Config for one belt. Send If-None-Match with the last ETag: 304 if nothing changed.
+    ?wait=N holds the request up to N seconds until the config changes (long-poll).
+    """
+    etag, wait = config_request(request.headers.get("If-None-Match"), request.args)
+    if wait:
+        body, current = device_configs.wait(device_id, etag, wait)
+    else:
+        body, current = device_configs.config(device_id)
+    status = 304 if current == etag else 200
+    metrics.inc(f"device_config_{status}")
+    response = app.response_class(status=304) if status == 304 else jsonify(body)
+    response.headers["ETag"] = current
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route('/devices/<device_id>/config', methods=['PUT'])
+def update_device_config(device_id):
+    body, status = handle_config_update(device_id, request.get_json(silent=True))
+    return jsonify(body), status
+
+def config_request(if_none_match, args):
+    """(etag the device already has, seconds to long-poll) from a config GET"""
+    try:
+        wait = min(max(float(args.get("wait", 0)), 0), MAX_CONFIG_WAIT)
+    except ValueError:
+        wait = 0
+    etag = (if_none_match or "").strip() or None
+    return etag, wait if etag else 0
+
+def handle_config_update(device_id, data):
+    """Retune one belt: {"threshold": 2200, "cooldown_ms": null, ...} (null restores the default)"""
+    try:
+        device_configs.set_overrides(device_id, data)
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
+    print(f"🎛️ Retuned {device_id}: {data}")
+    body, etag = device_configs.config(device_id)
+    return dict(body, etag=etag), 200
+
+@app.route('/devices/<device_id>/history', methods=['GET'])
+def device_history(device_id):
+    body, status = handle_history(device_id, request.args)
+    return jsonify(body), status
+
+def handle_history(device_id, args):
+    """
+    Growl amplitude history for one belt.
+    Query: resolution=raw|minute|hour (default minute), since/until (epoch s), limit (newest N points)
+    """
+    resolution = args.get("resolution", "minute")
+    try:
+        since = float(args.get("since", 0))
+        until = float(args["until"]) if "until" in args else math.inf
+        limit = int(args["limit"]) if "limit" in args else None
+    except ValueError:
+        return {"status": "error", "error": "since, until and limit must be numbers"}, 400
+    if not math.isfinite(since) or ("until" in args and not math.isfinite(until)) or (limit is not None and limit < 1):
+        return {"status": "error", "error": "since and until must be finite, limit at least 1"}, 400
+    try:
+        points = amplitude_history.query(device_id, resolution, since, until, limit)
+    except ValueError as e:
+        return {"status": "error", "error": str(e)}, 400
+    return {"device_id": device_id, "resolution": resolution, "points": points}, 200
+
+@app.route('/orders/<order_id>', methods=['GET'])
+def order_status(order_id):
+    job = order_queue.get(order_id)
+    if job is None:
+        return jsonify({"status": "not_found", "order_id": order_id}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/orders/<order_id>/trace', methods=['GET'])
+def order_trace(order_id):
+    trace = metrics.get_trace(order_id)
+    if trace is None:
+        return jsonify({"status": "not_found", "order_id": order_id}), 404
+    return jsonify(trace), 200
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return jsonify(metrics_snapshot()), 200
+
+def metrics_snapshot():
+    snapshot = metrics.snapshot()
+    snapshot["order_queue"] = {"pending": order_queue.pending(), "workers": order_queue.workers, "coalesced": order_queue.coalesced}
+    snapshot["recommendation_flights"] = recommendation_flights.stats()
+    snapshot["recommendation_cache"] = recommendation_cache.stats()
+    snapshot["speculation"] = prefetcher.stats()
+    snapshot["hunger"] = hunger_prewarmer.stats()
+    snapshot["state"] = device_store.stats()
+    snapshot["growl_classifier"] = growl_classifier.stats()
+    snapshot["amplitude_history"] = amplitude_history.stats()
+    snapshot["device_overrides"] = device_configs.overrides()
+    snapshot["menu_catalog"] = menu_catalog.stats()
+    snapshot["claude"] = claude_caller.stats()
+    snapshot["startup"] = startup.status()
+    snapshot["browser_pools"] = {name: pool.stats() for name, pool in browser_pools.items()}
+    return snapshot
+
+@app.route('/ready', methods=['GET'])
+def readiness():
+    """200 once the order path is hot (Claude client built, bots imported, browsers up); 503 before"""
+    status = startup.status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route('/speculation/stats', methods=['GET'])
+def speculation_statistics():
+    return jsonify(prefetcher.stats()), 200
+
+@app.route('/hunger/stats', methods=['GET'])
+def hunger_statistics():
+    return jsonify(hunger_stats()), 200
+
+def hunger_stats():
+    stats = hunger_prewarmer.stats()
+    stats["windows"] = {d: hunger_model.windows(d, hunger_prewarmer.min_score) for d in hunger_model.device_ids()}
+    return stats
+
+@app.route('/race/stats', methods=['GET'])
+def race_statistics():
+    return jsonify(race_stats.summary()), 200
+
+def prewarm_browser_pools():
+    """Pre-launch browsers so the first real order skips the cold Chrome start"""
+    if os.getenv("ENABLE_REAL_ORDERS", "false").lower() == "true" and os.getenv("BROWSER_POOL_PREWARM", "true").lower() == "true":
+        for name in order_platforms():
+            get_browser_pool(name).warm()
+
+def start_hunger_prewarmer():
+    if HUNGER_PREWARM:
+        hunger_prewarmer.start(interval=float(os.getenv("HUNGER_TICK", "30")))
+
+app_started = False
+app_start_lock = threading.Lock()
+
+def create_app(warmup=None):
+    """
+    App factory (gunicorn 'app:create_app()'): starts the background jobs and, with warmup
+    (default WARMUP), builds the order path in the background while requests are already served
+    """
+    global app_started
+    with app_start_lock:
+        if app_started:
+            return app
+        app_started = True
+    start_hunger_prewarmer()
+    if WARMUP if warmup is None else warmup:
+        startup.start()
+    else:
+        prewarm_browser_pools()
+    return app
+
+@app.before_request
+def start_on_first_request():
+    """Served as plain app:app (no factory): start the background jobs with the first request"""
+    if not app_started:
+        create_app()
+
+startup.imported()
+
+if __name__ == '__main__':
+    create_app().run(host='0.0.0.0', port=5000, threaded=True)
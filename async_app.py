@@ -0,0 +1,243 @@
+"""
+Async Server Mode - the MOM endpoints on ASGI (Starlette + uvicorn), so thousands of belts
+can hold keep-alive connections without tying up a thread each.
+Growl handling reuses app.py's handlers. Claude requests from the order/speculation workers
+run on this event loop through AsyncAnthropic: at most CLAUDE_CONCURRENCY at once, over a
+pool of kept-alive HTTPS connections.
+
+Usage: python async_app.py      (or: uvicorn async_app:asgi_app --host 0.0.0.0 --port 5000)
+Compare against the Flask server with: python bench_async.py
+"""
+
+import asyncio
+import contextlib
+import os
+from urllib.parse import parse_qs
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from starlette.templating import Jinja2Templates
+
+import app as mom
+
+async_anthropic = None      # built on first use by get_async_anthropic()
+templates = Jinja2Templates(directory=os.path.dirname(os.path.abspath(__file__)))
+
+# The in-memory store applies a growl in microseconds under a per-device lock, so it runs
+# right on the event loop; the SQLite store waits on a commit, so it goes to the thread pool
+BLOCKING_STATE = mom.STATE_BACKEND != "memory"
+KEEP_ALIVE_TIMEOUT = int(os.getenv("ASYNC_KEEP_ALIVE", "75"))
+event_loop = None
+
+
+def get_async_anthropic():
+    global async_anthropic
+    if async_anthropic is None:
+        with mom.anthropic_lock:
+            if async_anthropic is None:
+                with mom.startup.timed("claude_client"):
+                    import httpx
+                    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+                    async_anthropic = AsyncAnthropic(
+                        api_key=mom.ANTHROPIC_API_KEY,
+                        http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                            max_connections=mom.claude_caller.concurrency,
+                            max_keepalive_connections=mom.claude_caller.concurrency,
+                            keepalive_expiry=60,
+                        )),
+                    )
+    return async_anthropic
+
+
+async def connect_claude():
+    from anthropic import APIStatusError
+
+    try:
+        await get_async_anthropic().with_options(max_retries=0, timeout=10).models.list(limit=1)
+    except APIStatusError:
+        pass
+
+
+# Claude requests go through the event-loop client here, so that's the one warmup builds
+mom.startup.step("claude_client", get_async_anthropic, check=lambda: async_anthropic is not None)
+mom.startup.step("claude_connection", lambda: asyncio.run_coroutine_threadsafe(connect_claude(), event_loop).result(),
+                 required=False, enabled=lambda: mom.WARMUP_CONNECT)
+
+
+def send_claude_request(**request):
+    """Worker threads hand their Claude request to the event loop and wait for the answer"""
+    future = asyncio.run_coroutine_threadsafe(mom.claude_caller.acreate(get_async_anthropic(), **request), event_loop)
+    return future.result()
+
+
+async def call(fn, *args):
+    if BLOCKING_STATE:
+        return await run_in_threadpool(fn, *args)
+    return fn(*args)
+
+
+async def json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return {}
+
+
+async def home(request):
+    await call(mom.sync_profile)
+    return templates.TemplateResponse(request, "setup.html", {"profile": mom.USER_MEDICAL_PROFILE})
+
+
+async def setup(request):
+    form = parse_qs((await request.body()).decode("utf-8", "replace"))
+    await run_in_threadpool(
+        mom.save_profile,
+        form.get("conditions", []),
+        form.get("restrictions", [""])[0],
+        form.get("goals", ["Healthy living"])[0],
+    )
+    return templates.TemplateResponse(request, "setup.html", {"status": "Profile Saved Successfully!"})
+
+
+async def detect(request):
+    data = await json_body(request)
+    with mom.metrics.timer("detect"):
+        body, status = await call(mom.handle_detect, data)
+    return JSONResponse(body, status)
+
+
+async def detect_batch(request):
+    data = await json_body(request)
+    with mom.metrics.timer("detect_batch"):
+        body, status = await call(mom.handle_batch, data)
+    return JSONResponse(body, status)
+
+
+async def detect_frames(request):
+    device_id = str(request.query_params.get("device_id") or request.headers.get("x-device-id") or mom.DEFAULT_DEVICE_ID)
+    too_big = JSONResponse({"status": "error", "error": f"at most {mom.MAX_FRAME_BYTES} bytes per upload"}, 413)
+    if int(request.headers.get("content-length") or 0) > mom.MAX_FRAME_BYTES:
+        return too_big
+    # Count what actually arrives: chunked uploads have no Content-Length
+    audio = bytearray()
+    async for chunk in request.stream():
+        audio += chunk
+        if len(audio) > mom.MAX_FRAME_BYTES:
+            return too_big
+    audio = bytes(audio)
+    with mom.metrics.timer("detect_frames"):
+        # FFTs are CPU work - keep them off the event loop
+        body, status = await run_in_threadpool(mom.handle_frames, device_id, request.query_params, audio)
+    return JSONResponse(body, status)
+
+
+async def device_config(request):
+    device_id = request.path_params["device_id"]
+    etag, wait = mom.config_request(request.headers.get("if-none-match"), request.query_params)
+    if wait:
+        # Long-polls park on the event loop rather than holding a thread each
+        body, current = await mom.device_configs.wait_async(device_id, etag, wait, call=call)
+    else:
+        body, current = await call(mom.device_configs.config, device_id)
+    headers = {"ETag": current, "Cache-Control": "no-cache"}
+    mom.metrics.inc("device_config_304" if current == etag else "device_config_200")
+    if current == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(body, headers=headers)
+
+
+async def update_device_config(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    body, status = await call(mom.handle_config_update, request.path_params["device_id"], data)
+    return JSONResponse(body, status)
+
+
+async def device_history(request):
+    body, status = mom.handle_history(request.path_params["device_id"], request.query_params)
+    return JSONResponse(body, status)
+
+
+async def order_status(request):
+    order_id = request.path_params["order_id"]
+    job = mom.order_queue.get(order_id)
+    if job is None:
+        return JSONResponse({"status": "not_found", "order_id": order_id}, 404)
+    return JSONResponse(job.to_dict())
+
+
+async def order_trace(request):
+    order_id = request.path_params["order_id"]
+    trace = mom.metrics.get_trace(order_id)
+    if trace is None:
+        return JSONResponse({"status": "not_found", "order_id": order_id}, 404)
+    return JSONResponse(trace)
+
+
+async def metrics_endpoint(request):
+    return JSONResponse(await call(mom.metrics_snapshot))
+
+
+async def speculation_statistics(request):
+    return JSONResponse(mom.prefetcher.stats())
+
+
+async def hunger_statistics(request):
+    return JSONResponse(mom.hunger_stats())
+
+
+async def race_statistics(request):
+    return JSONResponse(mom.race_stats.summary())
+
+
+async def readiness(request):
+    status = mom.startup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    blocking_transport = mom.send_claude_request
+    mom.send_claude_request = send_claude_request
+    mom.create_app()    # background jobs + warmup; needs event_loop for the connection step
+    try:
+        yield
+    finally:
+        mom.send_claude_request = blocking_transport
+        if async_anthropic is not None:
+            await async_anthropic.close()
+
+
+asgi_app = Starlette(
+    routes=[
+        Route("/", home),
+        Route("/setup", setup, methods=["POST"]),
+        Route("/detect", detect, methods=["POST"]),
+        Route("/detect/batch", detect_batch, methods=["POST"]),
+        Route("/detect/frames", detect_frames, methods=["POST"]),
+        Route("/devices/{device_id}/config", device_config),
+        Route("/devices/{device_id}/config", update_device_config, methods=["PUT"]),
+        Route("/devices/{device_id}/history", device_history),
+        Route("/orders/{order_id}", order_status),
+        Route("/orders/{order_id}/trace", order_trace),
+        Route("/metrics", metrics_endpoint),
+        Route("/speculation/stats", speculation_statistics),
+        Route("/hunger/stats", hunger_statistics),
+        Route("/race/stats", race_statistics),
+        Route("/ready", readiness),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(asgi_app, host="0.0.0.0", port=5000, timeout_keep_alive=KEEP_ALIVE_TIMEOUT, backlog=4096)
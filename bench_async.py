@@ -0,0 +1,198 @@
+"""
+Concurrent-connection benchmark: the Flask server (app.py) vs the ASGI server (async_app.py).
+Each server runs in its own process with the Claude/browser stand-ins. One asyncio client
+opens N connections, each acting as a belt that posts /detect every --interval seconds over
+a kept-alive connection (it reconnects when the server closes the connection, as Flask's
+HTTP/1.0 dev server does after every response).
+
+Usage: python bench_async.py --connections 100,500,1000,2000 --duration 10 [--output bench_async.json]
+Prints one JSON report: per server and connection count, completed requests, errors, p50/p95/p99.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from benchmark import latency_summary, git_revision
+
+HOST = "127.0.0.1"
+
+
+def serve(kind, port, args):
+    """Run one server in this process (called in the child via --serve)"""
+    import logging
+
+    os.environ["ENABLE_REAL_ORDERS"] = "true"
+    os.environ.setdefault("USER_PHONE", "9876543210")
+    os.environ["WARMUP"] = "false"     # both servers start the same way
+
+    import app as server
+    import stand_ins
+
+    stand_ins.install(server, claude_latency=args.claude_latency, step_latency=args.step_latency)
+    server.device_store.min_growls = server.MIN_GROWLS_FOR_ORDER = args.min_growls
+
+    if kind == "flask":
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        server.app.run(host=HOST, port=port, threaded=True)
+    else:
+        import uvicorn
+        import async_app
+
+        async_app.async_anthropic = stand_ins.FakeAsyncAnthropic(args.claude_latency)
+        uvicorn.run(async_app.asgi_app, host=HOST, port=port, log_level="warning",
+                    timeout_keep_alive=async_app.KEEP_ALIVE_TIMEOUT, backlog=4096)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, args):
+    port = free_port()
+    cmd = [sys.executable, os.path.abspath(__file__), "--serve", kind, "--port", str(port),
+           "--claude-latency", str(args.claude_latency), "--step-latency", str(args.step_latency),
+           "--min-growls", str(args.min_growls)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+async def read_response(reader):
+    """Minimal HTTP/1.x response reader -> (status, keep_alive)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    version, status = lines[0].split(" ", 2)[:2]
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip().lower()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()     # body ends when the server closes
+        return int(status), False
+    keep_alive = headers.get("connection") != "close" and (version == "HTTP/1.1" or headers.get("connection") == "keep-alive")
+    return int(status), keep_alive
+
+
+async def belt(port, device_id, stop_at, interval, timeout, results):
+    body = json.dumps({"device_id": device_id, "amplitude": 3000}).encode()
+    request = (
+        f"POST /detect HTTP/1.1\r\nHost: {HOST}:{port}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode() + body
+    loop = asyncio.get_running_loop()
+    reader = writer = None
+    await asyncio.sleep(random.random() * interval)     # spread the first requests
+
+    while loop.time() < stop_at:
+        t = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+                results["connects"] += 1
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await asyncio.wait_for(read_response(reader), timeout)
+            results["latencies"].append(time.perf_counter() - t)
+            results["statuses"][status] += 1
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            results["errors"][type(e).__name__] += 1
+            keep_alive = False
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+        await asyncio.sleep(max(0, interval - (time.perf_counter() - t)))
+
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(port, connections, duration, interval, timeout, level):
+    results = {"latencies": [], "statuses": Counter(), "errors": Counter(), "connects": 0}
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        belt(port, f"bench-{level}-{i:05d}", stop_at, interval, timeout, results) for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    completed = len(results["latencies"])
+    return {
+        "connections": connections,
+        "offered_rps": round(connections / interval, 1),
+        "completed": completed,
+        "throughput_rps": round(completed / elapsed, 1),
+        "errors": dict(results["errors"]),
+        "http_status": {str(k): v for k, v in results["statuses"].items()},
+        "tcp_connects": results["connects"],
+        "latency": latency_summary(results["latencies"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask vs ASGI concurrent-connection benchmark")
+    parser.add_argument("--connections", default="100,500,1000,2000", help="comma-separated connection counts")
+    parser.add_argument("--servers", default="flask,asgi")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per connection count")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between growls per belt")
+    parser.add_argument("--timeout", type=float, default=10, help="per-request timeout")
+    parser.add_argument("--claude-latency", type=float, default=0.5)
+    parser.add_argument("--step-latency", type=float, default=0.2)
+    parser.add_argument("--min-growls", type=int, default=3)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the servers' stderr")
+    parser.add_argument("--serve", choices=["flask", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args)
+        return
+
+    levels = [int(n) for n in args.connections.split(",")]
+    report = {
+        "benchmark": "async_vs_flask",
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "serve", "port")},
+        "servers": {},
+    }
+    for kind in args.servers.split(","):
+        proc, port = start_server(kind, args)
+        try:
+            report["servers"][kind] = [
+                asyncio.run(run_level(port, n, args.duration, args.interval, args.timeout, level))
+                for level, n in enumerate(levels)
+            ]
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
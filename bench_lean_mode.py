@@ -0,0 +1,97 @@
+"""
+Benchmark: page load time, bytes transferred and browser memory with and without lean mode
+Usage: python bench_lean_mode.py --platform zomato --runs 3 [--headless] [--output lean.json]
+Prints one JSON report so results can be compared across commits.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from browser_pool import process_tree_rss_mb
+
+PAGES = {
+    "zomato": ["https://www.zomato.com/", "https://www.zomato.com/mangalore/restaurants"],
+    "swiggy": ["https://www.swiggy.com/", "https://www.swiggy.com/city/mangalore"],
+}
+
+_PAGE_STATS_JS = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var bytes = performance.getEntriesByType('resource')
+    .reduce(function (sum, r) { return sum + (r.transferSize || 0); }, nav.transferSize || 0);
+return {
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd || null,
+    resources: performance.getEntriesByType('resource').length,
+    transfer_bytes: bytes
+};
+"""
+
+
+def bot_class(platform):
+    if platform == "zomato":
+        from zomato_automation import ZomatoAutomation
+        return ZomatoAutomation
+    from swiggy_automation import SwiggyAutomation
+    return SwiggyAutomation
+
+
+def run_mode(platform, lean, runs, headless):
+    """Launch one browser in the given mode and load every page `runs` times"""
+    start = time.time()
+    driver = bot_class(platform).create_driver(headless=headless, lean=lean)
+    launch_s = time.time() - start
+
+    loads = []
+    try:
+        for _ in range(runs):
+            for url in PAGES[platform]:
+                driver.delete_all_cookies()
+                t = time.time()
+                driver.get(url)
+                stats = driver.execute_script(_PAGE_STATS_JS)
+                stats["url"] = url
+                stats["get_ms"] = round((time.time() - t) * 1000, 1)
+                loads.append(stats)
+        service = getattr(driver, "service", None)
+        memory_mb = process_tree_rss_mb(getattr(getattr(service, "process", None), "pid", None))
+    finally:
+        driver.quit()
+
+    get_ms = [l["get_ms"] for l in loads]
+    return {
+        "lean": lean,
+        "launch_s": round(launch_s, 2),
+        "loads": len(loads),
+        "get_ms_p50": statistics.median(get_ms),
+        "get_ms_max": max(get_ms),
+        "transfer_bytes_avg": int(statistics.mean(l["transfer_bytes"] for l in loads)),
+        "resources_avg": round(statistics.mean(l["resources"] for l in loads), 1),
+        "memory_mb": round(memory_mb, 1) if memory_mb else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare normal vs lean Chrome for the order bots")
+    parser.add_argument("--platform", choices=sorted(PAGES), default="zomato")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "lean_mode",
+        "platform": args.platform,
+        "timestamp": time.time(),
+        "modes": [run_mode(args.platform, lean, args.runs, args.headless) for lean in (False, True)],
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Cold-start benchmark for the MOM server. Every run is a fresh interpreter:
+  import  - time to `import app`, then what the first order would pay on top of it
+            (building the Claude client, importing selenium + the bot modules)
+  server  - time from launching `app.create_app()` until it accepts connections and until
+            GET /ready says the order path is hot, with warmup on and off
+
+Usage: python bench_startup.py --runs 5 [--real-orders] [--connect] [--output bench_startup.json]
+Prints one JSON report with the median (and max) of each timing.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+from benchmark import git_revision
+
+HOST = "127.0.0.1"
+
+IMPORT_PROBE = """
+import json, time
+t = time.perf_counter()
+import app
+imported = time.perf_counter() - t
+t = time.perf_counter()
+app.get_anthropic()
+client = time.perf_counter() - t
+t = time.perf_counter()
+try:
+    for name in app.BOT_CLASSES:
+        app.bot_class(name)
+    bots = time.perf_counter() - t
+except ImportError:
+    bots = None
+print(json.dumps({"import_s": imported, "claude_client_s": client, "order_modules_s": bots}))
+"""
+
+
+def child_env(args, warmup=True):
+    env = dict(os.environ)
+    env.update({
+        "WARMUP": "true" if warmup else "false",
+        "WARMUP_CONNECT": "true" if args.connect else "false",
+        "ENABLE_REAL_ORDERS": "true" if args.real_orders else "false",
+        "HUNGER_PREWARM": "false",
+        "TRACE_FILE": "",
+    })
+    return env
+
+
+def measure_import(args):
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True,
+                         env=child_env(args), cwd=os.path.dirname(os.path.abspath(__file__)), timeout=120)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def serve(port):
+    """Run the app through its factory in this process (called in the child via --serve)"""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    import app
+
+    app.create_app().run(host=HOST, port=port, threaded=True)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def measure_server(args, warmup):
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port)],
+                            env=child_env(args, warmup), stdout=subprocess.DEVNULL,
+                            stderr=None if args.verbose else subprocess.DEVNULL)
+    result = {"listen_s": None, "ready_s": None, "steps": None}
+    try:
+        deadline = start + args.timeout
+        while time.perf_counter() < deadline:
+            try:
+                response = requests.get(f"http://{HOST}:{port}/ready", timeout=1)
+            except requests.RequestException:
+                time.sleep(0.02)
+                continue
+            if result["listen_s"] is None:
+                result["listen_s"] = time.perf_counter() - start
+            status = response.json()
+            result["steps"] = status["steps"]
+            if response.status_code == 200:
+                result["ready_s"] = time.perf_counter() - start
+                break
+            if not warmup and status["state"] == "cold":
+                break       # nothing builds the order path until the first order
+            time.sleep(0.02)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return result
+
+
+def summary(runs, key):
+    values = [r[key] for r in runs if r[key] is not None]
+    if not values:
+        return None
+    return {"median_s": round(statistics.median(values), 3), "max_s": round(max(values), 3), "runs": len(values)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and startup-to-ready benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--real-orders", action="store_true", help="ENABLE_REAL_ORDERS=true: warmup also imports the bots and launches Chrome")
+    parser.add_argument("--connect", action="store_true", help="WARMUP_CONNECT=true: warmup also opens the API connection (needs network)")
+    parser.add_argument("--timeout", type=float, default=120, help="give up waiting for /ready after this many seconds")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the servers' stderr")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    imports = [measure_import(args) for _ in range(args.runs)]
+    report = {
+        "benchmark": "startup",
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "serve", "port")},
+        "import": {key: summary(imports, key) for key in ("import_s", "claude_client_s", "order_modules_s")},
+        "server": {},
+    }
+    for warmup in (True, False):
+        runs = [measure_server(args, warmup) for _ in range(args.runs)]
+        report["server"]["warmup" if warmup else "no_warmup"] = {
+            "listen": summary(runs, "listen_s"),
+            "ready": summary(runs, "ready_s"),
+            "steps": runs[-1]["steps"],
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
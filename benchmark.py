@@ -0,0 +1,260 @@
+"""
+Load benchmark for the MOM server - simulates many ESP32 belts growling at once
+(the non-interactive big brother of test_growl.py).
+
+By default it starts app.py in-process with local stand-ins for Claude and the
+Selenium bots, so it measures the server itself. Pass --url to hit a running server instead.
+
+Usage: python benchmark.py --devices 200 --rate 0.5 --duration 20 [--output bench.json]
+Prints one JSON report (throughput, p50/p95/p99 per endpoint, order outcomes).
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext, redirect_stdout
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from test_growl import SERVER_URL
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(samples):
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2) if values else None,
+        "p95_ms": round(percentile(values, 95) * 1000, 2) if values else None,
+        "p99_ms": round(percentile(values, 99) * 1000, 2) if values else None,
+        "max_ms": round(values[-1] * 1000, 2) if values else None,
+        "mean_ms": round(statistics.mean(values) * 1000, 2) if values else None,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def start_local_server(args):
+    """Load app.py with stand-ins and serve it on a free local port (HTTP/1.1 keep-alive)"""
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    os.environ["ENABLE_REAL_ORDERS"] = "true"
+    os.environ.setdefault("USER_PHONE", "9876543210")
+    os.environ["FOOD_PLATFORM"] = args.platform
+
+    import app as server
+    import stand_ins
+
+    stand_ins.install(
+        server,
+        claude_latency=args.claude_latency,
+        step_latency=args.step_latency,
+        success_rate=args.success_rate,
+    )
+    server.device_store.window_size = args.window
+    server.device_store.min_growls = args.min_growls
+    server.device_store.mute_duration = args.mute
+    server.MIN_GROWLS_FOR_ORDER = args.min_growls
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, name="bench-server", daemon=True).start()
+    return server, httpd, f"http://127.0.0.1:{httpd.server_port}"
+
+
+def build_schedule(devices, rate, duration, seed):
+    """Poisson growl arrivals per device, merged into one time-ordered list"""
+    rng = random.Random(seed)
+    events = []
+    for d in range(devices):
+        t = rng.expovariate(rate)
+        while t < duration:
+            events.append((t, f"bench-{d:05d}"))
+            t += rng.expovariate(rate)
+    heapq.heapify(events)
+    return [heapq.heappop(events) for _ in range(len(events))]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.order_ids = []
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, latency, status=None, error=None, order_id=None):
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            if status:
+                self.statuses[status] += 1
+            if error:
+                self.errors[f"{endpoint}: {error}"] += 1
+            if order_id:
+                self.order_ids.append(order_id)
+
+
+def run_load(base_url, schedule, workers, recorder):
+    """Open-loop load: each growl is sent at its scheduled time by a pool of workers"""
+    local = threading.local()
+    cursor = {"next": 0}
+    cursor_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        return local.session
+
+    def worker():
+        while True:
+            with cursor_lock:
+                if cursor["next"] >= len(schedule):
+                    return
+                at, device_id = schedule[cursor["next"]]
+                cursor["next"] += 1
+            delay = at - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+            t = time.perf_counter()
+            try:
+                response = session().post(f"{base_url}/detect", json={"device_id": device_id, "amplitude": 3000}, timeout=30)
+                body = response.json()
+                recorder.add("/detect", time.perf_counter() - t, status=body.get("status"), order_id=body.get("order_id"))
+            except Exception as e:
+                recorder.add("/detect", time.perf_counter() - t, error=type(e).__name__)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def collect_orders(base_url, recorder, timeout):
+    """Poll /orders/<id> until every accepted order has finished (or timeout)"""
+    outcomes = Counter()
+    order_latency = []
+    pending = list(recorder.order_ids)
+    deadline = time.time() + timeout
+    http = requests.Session()
+
+    while pending and time.time() < deadline:
+        still_running = []
+        for order_id in pending:
+            t = time.perf_counter()
+            try:
+                job = http.get(f"{base_url}/orders/{order_id}", timeout=10).json()
+                recorder.add("/orders/<id>", time.perf_counter() - t)
+            except Exception as e:
+                recorder.add("/orders/<id>", time.perf_counter() - t, error=type(e).__name__)
+                still_running.append(order_id)
+                continue
+            if job.get("status") in ("completed", "failed"):
+                outcomes[job["status"]] += 1
+                order_latency.append(job["updated_at"] - job["created_at"])
+            else:
+                still_running.append(order_id)
+        pending = still_running
+        if pending:
+            time.sleep(0.2)
+
+    outcomes["unfinished"] = len(pending)
+    return outcomes, order_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-device load benchmark for /detect")
+    parser.add_argument("--url", help=f"benchmark a running server (e.g. {SERVER_URL}) instead of an in-process one")
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0.5, help="growls per second per device")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of simulated traffic")
+    parser.add_argument("--workers", type=int, default=64, help="concurrent client connections")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--order-timeout", type=float, default=60)
+    # In-process server knobs
+    parser.add_argument("--platform", default="zomato", choices=["zomato", "swiggy", "race"])
+    parser.add_argument("--claude-latency", type=float, default=0.5)
+    parser.add_argument("--step-latency", type=float, default=0.2)
+    parser.add_argument("--success-rate", type=float, default=1.0)
+    parser.add_argument("--window", type=float, default=120)
+    parser.add_argument("--min-growls", type=int, default=3)
+    parser.add_argument("--mute", type=float, default=3600)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the server's own console output")
+    args = parser.parse_args()
+
+    server = httpd = None
+    base_url = args.url
+    schedule = build_schedule(args.devices, args.rate, args.duration, args.seed)
+    recorder = Recorder()
+
+    # The in-process server prints a few lines per order; keep the JSON report readable
+    with open(os.devnull, "w") as devnull, (nullcontext() if args.verbose else redirect_stdout(devnull)):
+        if not base_url:
+            server, httpd, base_url = start_local_server(args)
+        elapsed = run_load(base_url, schedule, args.workers, recorder)
+        outcomes, order_latency = collect_orders(base_url, recorder, args.order_timeout)
+
+    report = {
+        "benchmark": "detect_load",
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "requests_sent": len(schedule),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(schedule) / elapsed, 1) if elapsed else None,
+        "endpoints": {endpoint: latency_summary(samples) for endpoint, samples in recorder.latencies.items()},
+        "errors": dict(recorder.errors),
+        "detect_status": dict(recorder.statuses),
+        "orders": dict(outcomes),
+        "order_latency": latency_summary(order_latency),
+    }
+    if server is not None:
+        from lean_mode import lean_enabled
+        report["server"] = {
+            "claude_calls": server.anthropic.messages.calls,
+            "recommendation_cache": server.recommendation_cache.stats(),
+            "speculation": server.prefetcher.stats(),
+            "browser_pools": {name: pool.stats() for name, pool in server.browser_pools.items()},
+            "lean_mode": {p: lean_enabled(p) for p in ("zomato", "swiggy")},
+        }
+        httpd.shutdown()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Browser Pool - keeps a few Chrome/WebDriver sessions launched and warm so an order
+doesn't pay for a cold Chrome start. Sessions are health-checked, reset between
+orders and recycled after too many uses, on crash, or when memory runs over the cap.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import metrics
+
+
+def process_tree_rss_mb(root_pid):
+    """Resident memory (MB) of a process and all its children; None if /proc isn't available"""
+    if not root_pid or not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            pid = int(entry)
+            children.setdefault(int(fields[1]), []).append(pid)
+            rss_pages[pid] = int(fields[21])
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class PooledSession:
+    def __init__(self, driver, platform):
+        self.driver = driver
+        self.platform = platform
+        self.uses = 0
+        self.created_at = time.time()
+        self.broken = False
+
+    def pid(self):
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return getattr(process, "pid", None)
+
+    def memory_mb(self):
+        return process_tree_rss_mb(self.pid())
+
+
+class BrowserPool:
+    def __init__(self, factory, platform, size=1, max_uses=20, max_memory_mb=2048, lean=False):
+        """
+        factory: callable() -> new WebDriver (e.g. ZomatoAutomation.create_driver)
+        size: max sessions alive at once (idle + checked out)
+        max_uses: orders a session serves before it is recycled
+        max_memory_mb: total RSS budget for all sessions of this pool
+        lean: whether factory launches lean-mode browsers (reported in stats)
+        """
+        self.factory = factory
+        self.platform = platform
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.lean = lean
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)     # a launch finished (or failed)
+        self._alive = 0
+        self._launching = 0     # launches in progress (not yet alive)
+        self.launched = 0
+        self.recycled = 0
+
+    def warm(self, count=None):
+        """Pre-launch idle sessions on a background thread, up to count (default size) alive in total"""
+        with self._lock:
+            needed = max(0, min(count or self.size, self.size) - (self._alive + self._launching))
+            self._launching += needed       # reserved now, so a second warm() doesn't launch them again
+        if not needed:
+            return
+
+        def launch():
+            for _ in range(needed):
+                try:
+                    self._launch(idle=True)
+                except Exception as e:
+                    print(f"❌ Browser pre-launch failed: {e}")
+
+        threading.Thread(target=launch, name=f"{self.platform}-pool-warm", daemon=True).start()
+
+    def checkout(self, timeout=120):
+        """Take a healthy session from the pool, launching one if none are idle"""
+        with metrics.timer("browser_checkout_wait"):
+            acquired = self._slots.acquire(timeout=timeout)
+        if not acquired:
+            raise TimeoutError(f"No {self.platform} browser free after {timeout}s")
+        try:
+            while True:
+                with self._changed:
+                    # A warm() launch already fills the last place: wait for it rather than start another
+                    if not self._changed.wait_for(
+                        lambda: self._idle or not self._launching or self._alive + self._launching < self.size,
+                        timeout
+                    ):
+                        raise TimeoutError(f"No {self.platform} browser up after {timeout}s")
+                    session = self._idle.pop() if self._idle else None
+                    if session is None:
+                        self._launching += 1
+                if session is None:
+                    session = self._launch()
+                if self._healthy(session):
+                    return session
+                self._discard(session)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, session, broken=False):
+        """Return a session after an order; recycles it if it is worn out, crashed or too big"""
+        try:
+            session.uses += 1
+            if broken or session.broken or session.uses >= self.max_uses or not self._reset(session):
+                self._discard(session)
+                return
+
+            with self._lock:
+                self._idle.append(session)
+            self._enforce_memory_cap()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout=120):
+        session = self.checkout(timeout)
+        try:
+            yield session
+        except Exception:
+            session.broken = True
+            raise
+        finally:
+            self.release(session)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            memory = [s.memory_mb() for s in self._idle]
+        return {
+            "platform": self.platform,
+            "lean": self.lean,
+            "alive": self._alive,
+            "idle": idle,
+            "size": self.size,
+            "launched": self.launched,
+            "recycled": self.recycled,
+            "idle_memory_mb": round(sum(m for m in memory if m), 1) if any(memory) else None,
+        }
+
+    def _launch(self, idle=False):
+        """
+        Start one session; the caller has already counted it in _launching.
+        idle: park the new session in the pool (warm) instead of returning it for use
+        """
+        start = time.time()
+        try:
+            with metrics.timer("browser_launch"):
+                session = PooledSession(self.factory(), self.platform)
+        except Exception:
+            with self._changed:
+                self._launching -= 1
+                self._changed.notify_all()
+            raise
+        with self._changed:
+            self._launching -= 1
+            self._alive += 1
+            self.launched += 1
+            if idle:
+                self._idle.append(session)
+            self._changed.notify_all()
+        print(f"🌐 Launched {self.platform} browser in {time.time() - start:.1f}s")
+        return session
+
+    def _healthy(self, session):
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, session):
+        """Close extra tabs and park on a blank page; login cookies are kept"""
+        try:
+            driver = session.driver
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._alive -= 1
+            self.recycled += 1
+        metrics.inc("browser_recycled")
+
+    def _enforce_memory_cap(self):
+        """Recycle the biggest idle sessions until the pool fits in max_memory_mb"""
+        if not self.max_memory_mb:
+            return
+        with self._lock:
+            sized = [(s.memory_mb(), s) for s in self._idle]
+        if any(m is None for m, _ in sized):
+            return
+
+        total = sum(m for m, _ in sized)
+        for memory, session in sorted(sized, key=lambda x: x[0], reverse=True):
+            if total <= self.max_memory_mb:
+                break
+            with self._lock:
+                if session not in self._idle:
+                    continue
+                self._idle.remove(session)
+            print(f"♻️ Recycling {self.platform} browser using {memory:.0f} MB")
+            self._discard(session)
+            total -= memory
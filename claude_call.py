@@ -0,0 +1,169 @@
+"""
+Claude Call - sends a Messages request under a hard deadline. If the first attempt is
+slow a hedge copy is sent alongside it and the first answer wins; failed attempts are
+retried while time remains. The order path never waits longer than the deadline.
+acreate() is the same loop for the async client, with at most `concurrency` requests open.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from metrics import metrics
+
+
+def retryable(error):
+    """Rate limits, overload, 5xx and network errors are worth another attempt; bad requests are not"""
+    status = getattr(error, "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+class ClaudeCaller:
+    def __init__(self, deadline=12, hedge_after=4, max_attempts=3, workers=8, concurrency=16):
+        """
+        deadline: seconds before giving up on the whole call
+        hedge_after: seconds without an answer before sending another attempt alongside
+        max_attempts: attempts (hedges + retries) per call
+        workers: attempts in flight across all calls (blocking client)
+        concurrency: requests open at once across all calls (async client)
+        """
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.max_attempts = max(1, max_attempts)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="claude")
+        self.concurrency = concurrency
+        self._semaphore = None      # created on the event loop by the first acreate()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedge_wins = 0
+
+    def create(self, client, **request):
+        """client.messages.create(**request) with deadline/hedging; raises TimeoutError or the last error"""
+        give_up_at = time.monotonic() + self.deadline
+        # Each attempt gets its own HTTP timeout and no SDK-level retries - this loop owns retrying
+        client = client.with_options(timeout=self.deadline, max_retries=0)
+        attempts = []
+        failed = set()
+        last_error = None
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            pending = [f for f in attempts if not f.done()]
+            if not pending:
+                if len(attempts) >= self.max_attempts:
+                    break
+                if attempts:
+                    self._count("retries")
+                attempts.append(self._executor.submit(client.messages.create, **request))
+                continue
+
+            can_hedge = len(attempts) < self.max_attempts
+            done, _ = wait(pending, timeout=min(remaining, self.hedge_after) if can_hedge else remaining,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is not attempts[0] and not attempts[0].done():
+                        self._count("hedge_wins")
+                    for other in attempts:
+                        other.cancel()
+                    return future.result()
+                if future not in failed:
+                    failed.add(future)
+                    last_error = error
+                    if not retryable(error):
+                        raise error
+            if not done and can_hedge:
+                self._count("hedges")
+                attempts.append(self._executor.submit(client.messages.create, **request))
+
+        for future in attempts:
+            future.cancel()
+        if last_error is not None and all(f.done() for f in attempts):
+            raise last_error
+        self._count("timeouts")
+        raise TimeoutError(f"Claude did not answer within {self.deadline}s ({len(attempts)} attempts)")
+
+    async def acreate(self, client, **request):
+        """await client.messages.create(**request) with the same deadline/hedging rules"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+        client = client.with_options(timeout=self.deadline, max_retries=0)
+        attempts = []
+        failed = set()
+        last_error = None
+        with self._lock:
+            self.calls += 1
+
+        async def attempt():
+            # Waiting for a slot counts against the deadline too
+            async with self._semaphore:
+                return await client.messages.create(**request)
+
+        try:
+            while True:
+                remaining = give_up_at - loop.time()
+                if remaining <= 0:
+                    break
+                pending = [t for t in attempts if not t.done()]
+                if not pending:
+                    if len(attempts) >= self.max_attempts:
+                        break
+                    if attempts:
+                        self._count("retries")
+                    attempts.append(asyncio.ensure_future(attempt()))
+                    continue
+
+                can_hedge = len(attempts) < self.max_attempts
+                done, _ = await asyncio.wait(pending, timeout=min(remaining, self.hedge_after) if can_hedge else remaining,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not attempts[0] and not attempts[0].done():
+                            self._count("hedge_wins")
+                        return task.result()
+                    if task not in failed:
+                        failed.add(task)
+                        last_error = error
+                        if not retryable(error):
+                            raise error
+                if not done and can_hedge:
+                    self._count("hedges")
+                    attempts.append(asyncio.ensure_future(attempt()))
+        finally:
+            # Unlike threads, losing attempts can really be cancelled (closing their connections)
+            for task in attempts:
+                task.cancel()
+
+        if last_error is not None and all(t in failed for t in attempts):
+            raise last_error
+        self._count("timeouts")
+        raise TimeoutError(f"Claude did not answer within {self.deadline}s ({len(attempts)} attempts)")
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        metrics.inc(f"claude_{name}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "deadline_s": self.deadline,
+                "hedge_after_s": self.hedge_after,
+            }
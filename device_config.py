@@ -0,0 +1,139 @@
+"""
+Device Config - what each belt should be doing right now: detection tunables (retunable
+per device without reflashing) plus the server's growl window and the device's mute-until.
+Served with a weak ETag so an unchanged poll is a bodyless 304, and long-polls wake the
+moment a device's config changes (e.g. it just ordered and is now muted), so belts can
+stop transmitting for the mute hour.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from state_backend import MemoryOverrideStore
+
+# Tunables a device can be retuned with, and their allowed range
+TUNABLES = {
+    "threshold": (100, 4095),               # peak-to-peak ADC counts for a loud snapshot
+    "min_growl_duration_ms": (100, 10000),  # loud this long = one growl
+    "snapshot_ms": (10, 1000),              # sampling window per peak-to-peak measurement
+    "cooldown_ms": (0, 600000),             # pause after reporting a growl
+}
+
+
+class DeviceConfigs:
+    def __init__(self, store, defaults, recheck=None, saved=None):
+        """
+        store: DeviceStore (or SQLiteDeviceStore) - source of window settings and mute state
+        defaults: tunable -> value used unless a device has an override
+        recheck: seconds between store re-reads while long-polling, for mutes and retunes made
+                 by other worker processes (None = only wake on changed() in this process)
+        saved: where overrides are kept (state_backend Memory/SQLiteOverrideStore)
+        """
+        self.store = store
+        self.defaults = dict(defaults)
+        self.recheck = recheck
+        self.saved = saved or MemoryOverrideStore()
+        self._versions = {}         # device_id -> bumped on every change
+        self._cond = threading.Condition()
+        self._async_waiters = {}    # device_id -> [(loop, future)]
+
+    def config(self, device_id):
+        """Current config for device_id -> (body, etag)"""
+        state = self.store.snapshot(device_id)
+        overrides = self.saved.load(device_id)
+        body = {
+            "device_id": device_id,
+            **self.defaults,
+            **overrides,
+            "window_size": self.store.window_size,
+            "min_growls": self.store.min_growls,
+            "mute_duration": self.store.mute_duration,
+            "muted_until": state["muted_until"],
+        }
+        etag = 'W/"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()[:16] + '"'
+        # Volatile fields stay out of the ETag: devices without a clock count down mute_remaining_s
+        now = self.store.clock()
+        body["server_time"] = now
+        body["mute_remaining_s"] = round(max(0, state["muted_until"] - now), 1)
+        return body, etag
+
+    def set_overrides(self, device_id, values):
+        """Retune one device; a value of None drops that override. Raises ValueError on bad input"""
+        if not isinstance(values, dict):
+            raise ValueError("body must be a JSON object")
+        updates = {}
+        for name, value in values.items():
+            if name not in TUNABLES:
+                raise ValueError(f"unknown setting '{name}' (allowed: {', '.join(TUNABLES)})")
+            if value is not None:
+                low, high = TUNABLES[name]
+                if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+                    raise ValueError(f"{name} must be an integer in [{low}, {high}]")
+            updates[name] = value
+        self.saved.update(device_id, updates)
+        self.changed(device_id)
+
+    def changed(self, device_id):
+        """Wake everyone long-polling this device's config"""
+        with self._cond:
+            self._versions[device_id] = self._versions.get(device_id, 0) + 1
+            self._cond.notify_all()
+            waiters = self._async_waiters.pop(device_id, [])
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def wait(self, device_id, etag, timeout):
+        """Block until the config's ETag differs from etag or timeout passes -> (body, etag)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                version = self._versions.get(device_id, 0)
+            body, current = self.config(device_id)
+            remaining = deadline - time.monotonic()
+            if current != etag or remaining <= 0:
+                return body, current
+            with self._cond:
+                self._cond.wait_for(lambda: self._versions.get(device_id, 0) != version, self._slice(remaining))
+
+    async def wait_async(self, device_id, etag, timeout, call=None):
+        """
+        wait() for the ASGI server: parks a future instead of a thread.
+        call: async (fn, *args) runner for config(), e.g. one that uses the thread pool for SQLite
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            future = loop.create_future()
+            with self._cond:
+                self._async_waiters.setdefault(device_id, []).append((loop, future))
+            body, current = await call(self.config, device_id) if call else self.config(device_id)
+            remaining = deadline - loop.time()
+            if current != etag or remaining <= 0:
+                self._discard_waiter(device_id, future)
+                return body, current
+            try:
+                await asyncio.wait_for(future, self._slice(remaining))
+            except asyncio.TimeoutError:
+                self._discard_waiter(device_id, future)
+
+    def _slice(self, remaining):
+        return remaining if self.recheck is None else min(remaining, self.recheck)
+
+    def _discard_waiter(self, device_id, future):
+        with self._cond:
+            waiters = self._async_waiters.get(device_id)
+            if waiters:
+                waiters[:] = [w for w in waiters if w[1] is not future]
+                if not waiters:
+                    del self._async_waiters[device_id]
+
+    def overrides(self):
+        return self.saved.all()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,144 @@
+"""
+Simulated ESP32 belt - behaves like esp32_firmware.ino against a real or local server:
+long-polls /devices/<id>/config for its threshold and mute-until, growls at random,
+uploads growls to /detect/batch, and stays quiet while muted.
+
+Usage: python device_sim.py --local --duration 30 --growl-rate 0.5 --mute 10 --retune 2200
+       python device_sim.py --url http://192.168.1.20:5000 --device sim-belt-1
+Prints one JSON report (growls sent vs suppressed while muted, config updates received).
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+import requests
+
+from test_growl import SERVER_URL
+
+
+def start_local_server(args):
+    """Serve app.py with the Claude/browser stand-ins on a free local port"""
+    import os
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    os.environ["ENABLE_REAL_ORDERS"] = "false"
+    os.environ["SPECULATIVE_PREFETCH"] = "false"
+
+    import app as server
+    import stand_ins
+
+    stand_ins.install(server, claude_latency=0.2)
+    server.device_store.min_growls = server.MIN_GROWLS_FOR_ORDER = args.min_growls
+    server.device_store.mute_duration = args.mute
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, name="sim-server", daemon=True).start()
+    return f"http://127.0.0.1:{httpd.server_port}"
+
+
+class SimulatedBelt:
+    def __init__(self, url, device_id, poll_wait):
+        self.url = url
+        self.device_id = device_id
+        self.poll_wait = poll_wait
+        self.config = {"threshold": 2500, "min_growl_duration_ms": 1500}
+        self.mute_until = 0         # local monotonic clock, like millis() on the belt
+        self.etag = None
+        self.stats = Counter()
+        self.updates = []
+        self.running = True
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.next_id = 0
+        self.session = requests.Session()
+
+    def muted(self):
+        return time.monotonic() < self.mute_until
+
+    def poll_config(self):
+        """The firmware's configTask: long-poll with If-None-Match, apply every 200"""
+        session = requests.Session()
+        while self.running:
+            headers = {"If-None-Match": self.etag} if self.etag else {}
+            try:
+                response = session.get(f"{self.url}/devices/{self.device_id}/config",
+                                       params={"wait": self.poll_wait}, headers=headers, timeout=self.poll_wait + 10)
+            except requests.RequestException:
+                self.stats["config_errors"] += 1
+                time.sleep(1)
+                continue
+            self.stats[f"config_{response.status_code}"] += 1
+            if response.status_code != 200:
+                continue
+            body = response.json()
+            self.etag = response.headers.get("ETag")
+            self.config = body
+            self.mute_until = time.monotonic() + body["mute_remaining_s"]
+            self.updates.append({"threshold": body["threshold"], "mute_remaining_s": body["mute_remaining_s"]})
+            print(f"🎛️ Config: threshold={body['threshold']} muted for {body['mute_remaining_s']}s")
+
+    def growl(self, amplitude):
+        """One sustained loud sound; uploaded unless the belt is muted or it's below threshold"""
+        if amplitude <= self.config["threshold"]:
+            self.stats["below_threshold"] += 1
+            return
+        if self.muted():
+            self.stats["suppressed"] += 1
+            return
+        event = {"id": f"{self.boot_id}-{self.next_id}", "age_ms": 0, "amplitude": amplitude}
+        self.next_id += 1
+        response = self.session.post(f"{self.url}/detect/batch",
+                                     json={"device_id": self.device_id, "events": [event]}, timeout=30)
+        result = response.json()
+        self.stats["sent"] += 1
+        self.stats[f"server_{result['results'][0]['status']}"] += 1
+        if result.get("order_ids"):
+            print(f"🍱 Order {result['order_ids'][0]} - waiting for the mute to arrive by long-poll")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated MOM belt")
+    parser.add_argument("--url", default=SERVER_URL)
+    parser.add_argument("--local", action="store_true", help="start app.py in-process with stand-ins")
+    parser.add_argument("--device", default="sim-belt")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--growl-rate", type=float, default=0.5, help="loud sounds per second")
+    parser.add_argument("--poll-wait", type=float, default=25, help="config long-poll seconds")
+    parser.add_argument("--retune", type=int, help="PUT this threshold halfway through the run")
+    parser.add_argument("--min-growls", type=int, default=3, help="(--local) growls per order")
+    parser.add_argument("--mute", type=float, default=10, help="(--local) mute seconds after an order")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    url = start_local_server(args) if args.local else args.url
+    belt = SimulatedBelt(url, args.device, args.poll_wait)
+    threading.Thread(target=belt.poll_config, name="config-poll", daemon=True).start()
+
+    start = time.monotonic()
+    retuned = args.retune is None
+    while time.monotonic() - start < args.duration:
+        time.sleep(random.expovariate(args.growl_rate))
+        if not retuned and time.monotonic() - start > args.duration / 2:
+            requests.put(f"{url}/devices/{args.device}/config", json={"threshold": args.retune}, timeout=10)
+            retuned = True
+        belt.growl(random.randint(1500, 4000))
+    belt.running = False
+
+    print(json.dumps({
+        "device_id": args.device,
+        "duration_s": args.duration,
+        "growls": dict(belt.stats),
+        "config_updates": belt.updates,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
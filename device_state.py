@@ -0,0 +1,146 @@
+"""
+Per-Device Growl State - one sliding window and mute timer per ESP32,
+each guarded by its own lock so devices never contend with each other.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+
+DEFAULT_DEVICE_ID = "default"
+SEEN_EVENT_IDS = 1024   # batch event ids remembered per device for retry dedupe
+
+
+class DeviceState:
+    __slots__ = ("device_id", "events", "last_order_time", "lock", "seen_ids", "seen_order")
+
+    def __init__(self, device_id):
+        self.device_id = device_id
+        self.events = deque()         # growl timestamps, oldest first
+        self.last_order_time = 0
+        self.lock = threading.Lock()
+        self.seen_ids = None          # created on the first batch upload
+        self.seen_order = None
+
+    def already_seen(self, event_id):
+        """Remember event_id; True if it was applied before (a retried upload)"""
+        if self.seen_ids is None:
+            self.seen_ids = set()
+            self.seen_order = deque()
+        if event_id in self.seen_ids:
+            return True
+        self.seen_ids.add(event_id)
+        self.seen_order.append(event_id)
+        if len(self.seen_order) > SEEN_EVENT_IDS:
+            self.seen_ids.discard(self.seen_order.popleft())
+        return False
+
+    def evict(self, now, window_size):
+        """Drop growls that fell out of the window (amortized O(1) per growl)"""
+        events = self.events
+        while events and now - events[0] >= window_size:
+            events.popleft()
+
+    def muted_until(self, mute_duration):
+        return self.last_order_time + mute_duration if self.last_order_time else 0
+
+
+class DeviceStore:
+    def __init__(self, window_size=120, min_growls=3, mute_duration=3600, clock=time.time, stripes=64):
+        """
+        window_size: seconds of growl history counted towards an order
+        min_growls: growls inside the window needed to trigger an order
+        mute_duration: seconds a device stays muted after it triggered an order
+        clock: time source (swap for a virtual clock in tests/replays)
+        stripes: number of locks used to guard device creation
+        """
+        self.window_size = window_size
+        self.min_growls = min_growls
+        self.mute_duration = mute_duration
+        self.clock = clock
+        self._devices = {}
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+
+    def get(self, device_id):
+        """Return the state for device_id, creating it on first use"""
+        state = self._devices.get(device_id)
+        if state is None:
+            with self._stripes[hash(device_id) % len(self._stripes)]:
+                state = self._devices.get(device_id)
+                if state is None:
+                    state = DeviceState(device_id)
+                    self._devices[device_id] = state
+        return state
+
+    def record_growl(self, device_id, now=None):
+        """
+        Apply one growl to the device's window.
+        Returns {"status": "muted" | "monitoring" | "triggered", "count": n, ...}
+        A "triggered" result has already muted the device and cleared its window.
+        """
+        state = self.get(device_id)
+        with state.lock:
+            if now is None:
+                now = self.clock()
+            return self._apply(state, now)
+
+    def record_batch(self, device_id, events):
+        """
+        Apply many growls for one device in timestamp order under a single lock.
+        events: iterable of (event_id or None, timestamp)
+        Returns one result per event, in the order applied; retried ids get {"status": "duplicate"}.
+        """
+        state = self.get(device_id)
+        results = []
+        with state.lock:
+            for event_id, timestamp in sorted(events, key=lambda e: e[1]):
+                if event_id is not None and state.already_seen(event_id):
+                    results.append({"status": "duplicate", "event_id": event_id})
+                    continue
+                result = self._apply(state, timestamp)
+                result["event_id"] = event_id
+                results.append(result)
+        return results
+
+    def _apply(self, state, now):
+        """Window/mute/trigger logic for one growl; caller holds state.lock"""
+        if now - state.last_order_time < self.mute_duration:
+            return {"status": "muted", "count": 0, "muted_until": state.muted_until(self.mute_duration)}
+
+        events = state.events
+        if events and now < events[-1]:
+            # Late event from a batch upload: keep the window sorted
+            events.insert(bisect.bisect(events, now), now)
+        else:
+            events.append(now)
+        state.evict(events[-1], self.window_size)
+        count = len(events)
+
+        if count >= self.min_growls:
+            state.last_order_time = max(now, state.last_order_time)
+            events.clear()
+            return {"status": "triggered", "count": count, "muted_until": state.muted_until(self.mute_duration)}
+
+        # When the oldest growl in the window ages out the count drops
+        return {"status": "monitoring", "count": count, "window_expires_at": events[0] + self.window_size}
+
+    def snapshot(self, device_id):
+        """Current window size and mute state for one device"""
+        state = self.get(device_id)
+        with state.lock:
+            now = self.clock()
+            state.evict(now, self.window_size)
+            muted_until = state.muted_until(self.mute_duration)
+            return {
+                "device_id": device_id,
+                "count": len(state.events),
+                "muted": now < muted_until,
+                "muted_until": muted_until,
+            }
+
+    def device_ids(self):
+        return list(self._devices)
+
+    def stats(self):
+        return {"backend": "memory", "devices": len(self._devices)}
@@ -1,69 +1,172 @@
-#include <WiFi.h>
-#include <HTTPClient.h>
-
-// WiFi Credentials
-const char* ssid = "YOUR_WIFI_SSID";
-const char* password = "YOUR_WIFI_PASSWORD";
-const char* serverName = "http://YOUR_LOCAL_IP:5000/detect";
-
-const int micPin = 34; // ADC pin
-const int threshold = 2500; // Increased threshold to avoid heartbeat interference
-const int sampleWindow = 100; // Longer window for better signal averaging
-
-void setup() {
-  Serial.begin(115200);
-  WiFi.begin(ssid, password);
-  while (WiFi.status() != WL_CONNECTED) { delay(500); Serial.print("."); }
-  Serial.println("\nWiFi Connected!");
-}
-
-unsigned long soundStartTime = 0;
-const int MIN_GROWL_DURATION = 1500; // Must be loud for at least 1.5 seconds
-
-void loop() {
-  unsigned long startMillis = millis(); 
-  unsigned int peakToPeak = 0;   
-  unsigned int signalMax = 0;
-  unsigned int signalMin = 4095;
-
-  // 1. Capture a 50ms snapshot
-  while (millis() - startMillis < 50) {
-    int sample = analogRead(micPin);
-    if (sample < 4096) {
-      if (sample > signalMax) signalMax = sample;
-      else if (sample < signalMin) signalMin = sample;
-    }
-  }
-  peakToPeak = signalMax - signalMin;
-
-  // 2. Logic Filter
-  if (peakToPeak > threshold) {
-    if (soundStartTime == 0) {
-      soundStartTime = millis(); // Sound just started
-    } else {
-      unsigned long duration = millis() - soundStartTime;
-      Serial.printf("Sustained sound: %lu ms\n", duration);
-      
-      // Only trigger if sound has been loud for MIN_GROWL_DURATION
-      if (duration > MIN_GROWL_DURATION) {
-        Serial.println("REAL GROWL DETECTED!");
-        sendTrigger(peakToPeak);
-        soundStartTime = 0; // Reset
-        delay(60000); // Sleep for 1 minute after ordering
-      }
-    }
-  } else {
-    soundStartTime = 0; // Sound stopped or was too quiet, reset timer
-  }
-}
-
-void sendTrigger(int amplitude) {
-  if (WiFi.status() == WL_CONNECTED) {
-    HTTPClient http;
-    http.begin(serverName);
-    http.addHeader("Content-Type", "application/json");
-    String httpRequestData = "{\"amplitude\":" + String(amplitude) + "}";
-    http.POST(httpRequestData);
-    http.end();
-  }
-}
+#include <WiFi.h>
+#include <HTTPClient.h>
+
+// WiFi Credentials
+const char* ssid = "YOUR_WIFI_SSID";
+const char* password = "YOUR_WIFI_PASSWORD";
+const char* serverName = "http://YOUR_LOCAL_IP:5000/detect/batch";
+const char* configServer = "http://YOUR_LOCAL_IP:5000/devices/"; // + MAC + "/config"
+
+const int micPin = 34; // ADC pin
+// Tunables below are starting values; the server can change them at runtime (see configTask)
+volatile int threshold = 2500; // Increased threshold to avoid heartbeat interference
+volatile int snapshotMs = 50;
+volatile int cooldownMs = 60000;
+volatile unsigned long muteUntil = 0; // millis() until which the server ignores our growls
+const int sampleWindow = 100; // Longer window for better signal averaging
+
+// Growls waiting for upload - kept until the server acknowledges them, so a dropped
+// connection only delays events instead of losing them
+const int MAX_PENDING = 32;
+const unsigned long RETRY_INTERVAL = 5000;
+struct GrowlEvent { uint32_t id; unsigned long at; int amplitude; };
+GrowlEvent pending[MAX_PENDING];
+int pendingCount = 0;
+uint32_t bootId = 0;
+uint32_t nextEventId = 0;
+unsigned long lastFlushAttempt = 0;
+HTTPClient http;
+
+void setup() {
+  Serial.begin(115200);
+  WiFi.begin(ssid, password);
+  while (WiFi.status() != WL_CONNECTED) { delay(500); Serial.print("."); }
+  Serial.println("\nWiFi Connected!");
+  bootId = esp_random(); // event ids stay unique across reboots
+  http.setReuse(true);   // keep the TCP connection open between uploads
+  // Config long-poll runs on the other core so it never stalls sampling
+  xTaskCreatePinnedToCore(configTask, "config", 8192, NULL, 1, NULL, 0);
+}
+
+unsigned long soundStartTime = 0;
+volatile int MIN_GROWL_DURATION = 1500; // Must be loud for at least 1.5 seconds
+
+void loop() {
+  // Muted after an order: the server would ignore growls anyway, so don't send them
+  if ((long)(muteUntil - millis()) > 0) {
+    soundStartTime = 0;
+    delay(1000);
+    return;
+  }
+
+  // Retry anything a previous upload failed to deliver
+  if (pendingCount > 0 && millis() - lastFlushAttempt > RETRY_INTERVAL) {
+    flushGrowls();
+  }
+
+  unsigned long startMillis = millis(); 
+  unsigned int peakToPeak = 0;   
+  unsigned int signalMax = 0;
+  unsigned int signalMin = 4095;
+
+  // 1. Capture a snapshot (50ms unless retuned)
+  while (millis() - startMillis < (unsigned long)snapshotMs) {
+    int sample = analogRead(micPin);
+    if (sample < 4096) {
+      if (sample > signalMax) signalMax = sample;
+      else if (sample < signalMin) signalMin = sample;
+    }
+  }
+  peakToPeak = signalMax - signalMin;
+
+  // 2. Logic Filter
+  if (peakToPeak > threshold) {
+    if (soundStartTime == 0) {
+      soundStartTime = millis(); // Sound just started
+    } else {
+      unsigned long duration = millis() - soundStartTime;
+      Serial.printf("Sustained sound: %lu ms\n", duration);
+      
+      // Only trigger if sound has been loud for MIN_GROWL_DURATION
+      if (duration > MIN_GROWL_DURATION) {
+        Serial.println("REAL GROWL DETECTED!");
+        sendTrigger(peakToPeak);
+        soundStartTime = 0; // Reset
+        delay(cooldownMs); // Sleep for 1 minute after ordering
+      }
+    }
+  } else {
+    soundStartTime = 0; // Sound stopped or was too quiet, reset timer
+  }
+}
+
+void sendTrigger(int amplitude) {
+  queueGrowl(amplitude);
+  flushGrowls();
+}
+
+void queueGrowl(int amplitude) {
+  if (pendingCount == MAX_PENDING) {
+    // Buffer full: drop the oldest event
+    memmove(pending, pending + 1, sizeof(GrowlEvent) * (MAX_PENDING - 1));
+    pendingCount--;
+  }
+  pending[pendingCount++] = { nextEventId++, millis(), amplitude };
+}
+
+bool flushGrowls() {
+  lastFlushAttempt = millis();
+  if (pendingCount == 0 || WiFi.status() != WL_CONNECTED) return false;
+
+  // The MAC address gives every belt its own growl window on the server
+  unsigned long now = millis();
+  String body = "{\"device_id\":\"" + WiFi.macAddress() + "\",\"events\":[";
+  for (int i = 0; i < pendingCount; i++) {
+    if (i > 0) body += ",";
+    body += "{\"id\":\"" + String(bootId, HEX) + "-" + String(pending[i].id) + "\"";
+    body += ",\"age_ms\":" + String(now - pending[i].at);
+    body += ",\"amplitude\":" + String(pending[i].amplitude) + "}";
+  }
+  body += "]}";
+
+  http.begin(serverName);
+  http.addHeader("Content-Type", "application/json");
+  int code = http.POST(body);
+  http.end();
+
+  // Event ids make a resend of an already-applied batch harmless
+  if (code == 200 || code == 202) {
+    pendingCount = 0;
+    return true;
+  }
+  Serial.printf("Upload failed (%d), %d growls queued\n", code, pendingCount);
+  return false;
+}
+
+// Long-polls GET /devices/<mac>/config: the server answers 304 while nothing changed
+// and replies as soon as the belt is muted or retuned
+void configTask(void* param) {
+  HTTPClient cfg;
+  String etag = "";
+  const char* headers[] = {"ETag"};
+  cfg.setReuse(true);
+  cfg.setTimeout(65000);
+  while (true) {
+    if (WiFi.status() != WL_CONNECTED) { delay(1000); continue; }
+    cfg.begin(String(configServer) + WiFi.macAddress() + "/config?wait=55");
+    cfg.collectHeaders(headers, 1);
+    if (etag.length() > 0) cfg.addHeader("If-None-Match", etag);
+    int code = cfg.GET();
+    if (code == 200) {
+      String body = cfg.getString();
+      etag = cfg.header("ETag");
+      threshold = jsonInt(body, "threshold", threshold);
+      MIN_GROWL_DURATION = jsonInt(body, "min_growl_duration_ms", MIN_GROWL_DURATION);
+      snapshotMs = jsonInt(body, "snapshot_ms", snapshotMs);
+      cooldownMs = jsonInt(body, "cooldown_ms", cooldownMs);
+      // The belt has no wall clock, so mute-until arrives as seconds from now
+      int muteSeconds = jsonInt(body, "mute_remaining_s", 0);
+      muteUntil = millis() + (unsigned long)muteSeconds * 1000UL;
+      Serial.printf("Config: threshold=%d min=%dms muted for %ds\n", threshold, MIN_GROWL_DURATION, muteSeconds);
+    }
+    cfg.end();
+    if (code != 200 && code != 304) delay(5000); // server down: don't spin
+  }
+}
+
+// Integer part of "key": value in a flat JSON object (enough for the config body)
+int jsonInt(const String& body, const char* key, int fallback) {
+  int at = body.indexOf(String("\"") + key + "\":");
+  if (at < 0) return fallback;
+  return body.substring(at + strlen(key) + 3).toInt();
+}
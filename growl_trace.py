@@ -0,0 +1,70 @@
+"""
+Growl Traces - record incoming /detect events to a compact trace file and read them
+back, plus a virtual clock so the detection logic can be replayed faster than real time.
+
+Trace format: one event per line, "timestamp<TAB>device_id<TAB>amplitude".
+A path ending in .gz is gzip-compressed.
+"""
+
+import gzip
+import threading
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TraceRecorder:
+    def __init__(self, path, flush_every=100):
+        """Append events to path, flushing every `flush_every` events"""
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def record(self, device_id, timestamp, amplitude=None):
+        line = f"{timestamp:.3f}\t{device_id}\t{'' if amplitude is None else amplitude}\n"
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        with _open(self.path, "a") as f:
+            f.writelines(self._buffer)
+        self._buffer = []
+
+
+def read_trace(path):
+    """Yield (timestamp, device_id, amplitude) tuples in file order"""
+    with _open(path, "r") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 2 or not parts[0]:
+                continue
+            amplitude = parts[2] if len(parts) > 2 else ""
+            yield float(parts[0]), parts[1], int(amplitude) if amplitude else None
+
+
+class VirtualClock:
+    """Callable clock for DeviceStore(clock=...) that only moves when told to"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def set(self, timestamp):
+        self.now = max(self.now, timestamp)
+
+    def advance(self, seconds):
+        self.now += seconds
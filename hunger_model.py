@@ -0,0 +1,394 @@
+"""
+Hunger Model - learns when each belt usually orders (by time of day) and gets the order
+path ready just before: a logged-in browser session and a computed recommendation are
+waiting when the third growl arrives, instead of a cold Chrome launch, login and Claude
+call at the worst moment. If no order comes by the end of the window they are released.
+
+Backtest on a recorded trace (see growl_trace.py) for a hit-rate/cost report:
+  python hunger_model.py growls.trace --lead 600 --min-score 0.3
+  python hunger_model.py --synthetic 28            # a made-up month of one belt's meals
+"""
+
+import argparse
+import io
+import json
+import random
+import threading
+import time
+from contextlib import redirect_stdout
+
+DAY = 86400
+
+
+class DeviceHistory:
+    __slots__ = ("orders", "growls", "day_weight", "days", "last_day")
+
+    def __init__(self, slots):
+        self.orders = [0.0] * slots     # time-decayed order weight per time-of-day slot
+        self.growls = [0.0] * slots
+        self.day_weight = 0.0           # time-decayed count of days the belt was active
+        self.days = 0
+        self.last_day = None
+
+
+class HungerModel:
+    def __init__(self, slot_minutes=30, half_life_days=14, growl_weight=0.1, min_days=3, utc_offset=None):
+        """
+        slot_minutes: time-of-day resolution
+        half_life_days: how fast old habits fade
+        growl_weight: how much a growl (vs an order) says about hunger in that slot
+        min_days: active days a belt needs before it gets predictions
+        utc_offset: seconds east of UTC for "time of day" (default: the server's timezone)
+        """
+        self.slot_s = slot_minutes * 60
+        self.slots = DAY // self.slot_s
+        self.half_life_s = half_life_days * DAY
+        self.growl_weight = growl_weight
+        self.min_days = min_days
+        self.utc_offset = -time.timezone if utc_offset is None else utc_offset
+        self._devices = {}
+        self._anchor = None
+        self._lock = threading.Lock()
+
+    def _weight(self, ts):
+        # Newer events weigh more; the anchor cancels out because scores are ratios
+        return 2 ** ((ts - self._anchor) / self.half_life_s)
+
+    def observe(self, device_id, ts, kind="growl"):
+        """Learn from one growl or order ("growl" | "order") at epoch time ts"""
+        local = ts + self.utc_offset
+        slot = int(local % DAY // self.slot_s)
+        day = int(local // DAY)
+        with self._lock:
+            if self._anchor is None:
+                self._anchor = ts
+            history = self._devices.get(device_id)
+            if history is None:
+                history = self._devices[device_id] = DeviceHistory(self.slots)
+            weight = self._weight(ts)
+            if history.last_day != day:
+                history.last_day = day
+                history.days += 1
+                history.day_weight += weight
+            if kind == "order":
+                history.orders[slot] += weight
+            else:
+                history.growls[slot] += weight
+
+    def scores(self, device_id):
+        """Expected orders per active day in each slot, or None if the belt is too new"""
+        with self._lock:
+            history = self._devices.get(device_id)
+            if history is None or history.days < self.min_days:
+                return None
+            return [(o + self.growl_weight * g) / history.day_weight
+                    for o, g in zip(history.orders, history.growls)]
+
+    def next_window(self, device_id, now, lead, min_score):
+        """First predicted hunger window that is open or starts within lead seconds -> (start, end, score)"""
+        scores = self.scores(device_id)
+        if scores is None:
+            return None
+        day_start = now - (now + self.utc_offset) % DAY
+        first = int((now - day_start) // self.slot_s)
+        for k in range(first, first + self.slots):
+            start = day_start + k * self.slot_s
+            if start > now + lead:
+                return None
+            if scores[k % self.slots] >= min_score:
+                end, best = start + self.slot_s, scores[k % self.slots]
+                for j in range(k + 1, k + self.slots):
+                    if scores[j % self.slots] < min_score:
+                        break
+                    end += self.slot_s
+                    best = max(best, scores[j % self.slots])
+                return start, end, best
+        return None
+
+    def device_ids(self):
+        with self._lock:
+            return list(self._devices)
+
+    def windows(self, device_id, min_score):
+        """The belt's hunger slots as {"HH:MM": score}"""
+        scores = self.scores(device_id) or []
+        return {f"{i * self.slot_s // 3600:02d}:{i * self.slot_s % 3600 // 60:02d}": round(s, 3)
+                for i, s in enumerate(scores) if s >= min_score}
+
+    def learn_trace(self, events, window_size, min_growls, mute_duration):
+        """Learn from a recorded trace; orders are re-derived with the server's growl rules"""
+        from device_state import DeviceStore
+        from growl_trace import VirtualClock
+
+        clock = VirtualClock()
+        store = DeviceStore(window_size, min_growls, mute_duration, clock=clock)
+        count = 0
+        for timestamp, device_id, _ in events:
+            clock.set(timestamp)
+            self.observe(device_id, timestamp, "growl")
+            if store.record_growl(device_id)["status"] == "triggered":
+                self.observe(device_id, timestamp, "order")
+            count += 1
+        return count
+
+
+class Arm:
+    """A prepared order path for one device's predicted window"""
+    __slots__ = ("device_id", "start", "end", "score", "armed_at", "warms", "handle", "released")
+
+    def __init__(self, device_id, start, end, score, armed_at, warms):
+        self.device_id = device_id
+        self.start = start
+        self.end = end
+        self.score = score
+        self.armed_at = armed_at
+        self.warms = warms          # this arm owns the pre-launched browser (only one at a time)
+        self.handle = None
+        self.released = False
+
+
+class HungerPrewarmer:
+    def __init__(self, model, warm=None, release=None, precompute=None, lead=600, min_score=0.3,
+                 clock=time.time, background=True):
+        """
+        warm: callable(device_id) -> handle for a launched, logged-in browser (or None)
+        release: callable(handle, used) - used=True hands it to the order, False frees it
+        precompute: callable() that computes (and caches) the recommendation
+        lead: seconds before a predicted window to get ready
+        min_score: expected orders per day a slot needs to count as a hunger window
+        background: prepare arms on their own thread (False runs them inline, for backtests)
+        """
+        self.model = model
+        self.warm = warm
+        self.release = release
+        self.precompute = precompute
+        self.lead = lead
+        self.min_score = min_score
+        self.clock = clock
+        self.background = background
+        self._arms = {}             # device_id -> Arm
+        self._done = {}             # device_id -> end of a window already used or expired
+        self._lock = threading.Lock()
+        self._thread = None
+        self.armed = 0
+        self.hits = 0               # order arrived while its device was armed
+        self.unpredicted = 0        # order with nothing armed
+        self.expired = 0            # window passed without an order
+        self.warmed = 0
+        self.precomputed = 0
+        self.prepare_s = 0.0
+        self.hold_s = 0.0           # browser-seconds held by arms
+        self.wasted_hold_s = 0.0    # ...of which for windows that never ordered
+
+    def tick(self, now=None):
+        """Arm devices whose hunger window is near; release the ones whose window has passed"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            expired = [arm for arm in self._arms.values() if arm.end <= now]
+            for arm in expired:
+                del self._arms[arm.device_id]
+                self._done[arm.device_id] = arm.end
+            self.expired += len(expired)
+            warming = any(arm.warms for arm in self._arms.values())
+            new = []
+            for device_id in self.model.device_ids():
+                if device_id in self._arms or self._done.get(device_id, 0) > now:
+                    continue
+                window = self.model.next_window(device_id, now, self.lead, self.min_score)
+                if window is None:
+                    continue
+                arm = Arm(device_id, *window, now, warms=self.warm is not None and not warming)
+                warming = warming or arm.warms
+                self._arms[device_id] = arm
+                new.append(arm)
+            self.armed += len(new)
+        for arm in expired:
+            self._finish(arm, now, used=False)
+        for arm in new:
+            print(f"🔮 {arm.device_id} usually gets hungry around {time.strftime('%H:%M', time.localtime(arm.start))} - getting ready")
+            if self.background:
+                threading.Thread(target=self._prepare, args=(arm,), name="hunger-prepare", daemon=True).start()
+            else:
+                self._prepare(arm)
+
+    def _prepare(self, arm):
+        start = time.perf_counter()
+        handle = None
+        if self.precompute:
+            try:
+                self.precompute()
+                self.precomputed += 1
+            except Exception as e:
+                print(f"⚠️ Hunger pre-compute failed: {e}")
+        if arm.warms:
+            try:
+                handle = self.warm(arm.device_id)
+            except Exception as e:
+                print(f"⚠️ Hunger pre-launch failed: {e}")
+        with self._lock:
+            self.prepare_s += time.perf_counter() - start
+            if handle is not None:
+                self.warmed += 1
+            late = arm.released
+            if not late:
+                arm.handle = handle
+        if late and handle is not None:
+            self.release(handle, False)
+
+    def order_started(self, device_id, now=None):
+        """An order is about to run: score the prediction and hand held browsers to the pool"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            arm = self._arms.pop(device_id, None)
+            if arm is None:
+                self.unpredicted += 1
+            else:
+                self.hits += 1
+                self._done[device_id] = arm.end
+            held = [a for a in self._arms.values() if a.handle is not None]
+        if arm is not None:
+            self._finish(arm, now, used=True)
+        # Orders share the browser pool, so another device's warm session serves this order too
+        for other in held:
+            self._finish(other, now, used=True, keep_armed=True)
+
+    def _finish(self, arm, now, used, keep_armed=False):
+        with self._lock:
+            handle, arm.handle = arm.handle, None
+            arm.released = not keep_armed
+            if handle is not None:
+                self.hold_s += now - arm.armed_at
+                if not used:
+                    self.wasted_hold_s += now - arm.armed_at
+        if handle is not None:
+            self.release(handle, used)
+
+    def start(self, interval=30):
+        """Run tick() every interval seconds on a background thread"""
+        if self._thread is not None:
+            return
+        def loop():
+            while True:
+                try:
+                    self.tick()
+                except Exception as e:
+                    print(f"⚠️ Hunger prewarm tick failed: {e}")
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=loop, name="hunger-prewarm", daemon=True)
+        self._thread.start()
+
+    def stats(self):
+        with self._lock:
+            orders = self.hits + self.unpredicted
+            finished = self.hits + self.expired
+            prepared = self.precomputed + self.warmed
+            return {
+                "armed": self.armed,
+                "active": len(self._arms),
+                "hits": self.hits,
+                "expired": self.expired,
+                "unpredicted_orders": self.unpredicted,
+                "hit_rate": round(self.hits / finished, 3) if finished else None,
+                "coverage": round(self.hits / orders, 3) if orders else None,
+                "precomputed": self.precomputed,
+                "browsers_warmed": self.warmed,
+                "mean_prepare_s": round(self.prepare_s / self.armed, 2) if self.armed and prepared else None,
+                "browser_hold_s": round(self.hold_s, 1),
+                "wasted_browser_hold_s": round(self.wasted_hold_s, 1),
+                "est_saved_s": round(self.hits * self.prepare_s / self.armed, 1) if self.armed else 0,
+            }
+
+
+def synthetic_trace(days, device_id="belt-1", meals=((8, 30), (13, 0), (20, 0)), skip=0.15, seed=1, start=None):
+    """A belt that growls (3-5 times) around the same meal times most days -> trace events"""
+    rng = random.Random(seed)
+    start = start if start is not None else (time.time() // DAY - days) * DAY + time.timezone
+    events = []
+    for day in range(days):
+        for hour, minute in meals:
+            if rng.random() < skip:
+                continue
+            t = start + day * DAY + hour * 3600 + minute * 60 + rng.gauss(0, 900)
+            for _ in range(rng.randint(3, 5)):
+                t += rng.uniform(5, 30)
+                events.append((t, device_id, rng.randint(2600, 3800)))
+        # a stray growl at a random hour
+        events.append((start + day * DAY + rng.uniform(0, DAY), device_id, 2700))
+    return sorted(events)
+
+
+def backtest(events, lead=600, min_score=0.3, interval=60, window_size=120, min_growls=3, mute_duration=3600,
+             launch_s=8.0, login_s=4.0, claude_s=3.0, **model_args):
+    """
+    Replay a trace in time order: the model only knows the past, ticks every `interval`
+    seconds of trace time, and each order is scored as a hit or unpredicted.
+    launch_s/login_s/claude_s: what a cold order pays for each step (for the savings estimate)
+    """
+    from device_state import DeviceStore
+    from growl_trace import VirtualClock
+
+    clock = VirtualClock()
+    model = HungerModel(**model_args)
+    prewarmer = HungerPrewarmer(model, warm=lambda device_id: device_id, release=lambda handle, used: None,
+                                precompute=lambda: None, lead=lead, min_score=min_score, clock=clock, background=False)
+    store = DeviceStore(window_size, min_growls, mute_duration, clock=clock)
+    with redirect_stdout(io.StringIO()):
+        replay_events(events, clock, model, prewarmer, store, interval)
+
+    report = prewarmer.stats()
+    report.pop("mean_prepare_s")
+    report["est_saved_s"] = round(report["hits"] * (launch_s + login_s + claude_s), 1)
+    report["wasted_claude_calls"] = report["expired"]
+    report["browser_hold_hours"] = round(report.pop("browser_hold_s") / 3600, 2)
+    report["wasted_browser_hold_hours"] = round(report.pop("wasted_browser_hold_s") / 3600, 2)
+    report["windows"] = {device_id: model.windows(device_id, min_score) for device_id in model.device_ids()}
+    return report
+
+
+def replay_events(events, clock, model, prewarmer, store, interval):
+    """Drive the model, prewarmer and growl rules through a trace on the virtual clock"""
+    next_tick = None
+    for timestamp, device_id, _ in events:
+        if next_tick is None:
+            next_tick = timestamp
+        while next_tick <= timestamp:
+            clock.set(next_tick)
+            prewarmer.tick(next_tick)
+            next_tick += interval
+        clock.set(timestamp)
+        model.observe(device_id, timestamp, "growl")
+        if store.record_growl(device_id)["status"] == "triggered":
+            prewarmer.order_started(device_id, timestamp)
+            model.observe(device_id, timestamp, "order")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest hunger-window pre-warming on a growl trace")
+    parser.add_argument("trace", nargs="?", help="trace file written with TRACE_FILE")
+    parser.add_argument("--synthetic", type=int, metavar="DAYS", help="backtest a synthetic belt instead")
+    parser.add_argument("--lead", type=float, default=600)
+    parser.add_argument("--min-score", type=float, default=0.3)
+    parser.add_argument("--slot-minutes", type=int, default=30)
+    parser.add_argument("--half-life-days", type=float, default=14)
+    parser.add_argument("--launch-s", type=float, default=8.0, help="cold Chrome launch")
+    parser.add_argument("--login-s", type=float, default=4.0, help="restoring the login")
+    parser.add_argument("--claude-s", type=float, default=3.0, help="recommendation call")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        events = synthetic_trace(args.synthetic)
+    elif args.trace:
+        from growl_trace import read_trace
+        events = list(read_trace(args.trace))
+    else:
+        parser.error("give a trace file or --synthetic DAYS")
+
+    report = backtest(events, lead=args.lead, min_score=args.min_score, launch_s=args.launch_s,
+                      login_s=args.login_s, claude_s=args.claude_s,
+                      slot_minutes=args.slot_minutes, half_life_days=args.half_life_days)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Lean Mode - Chrome settings for the order bots that skip everything the bot never looks at
+(images, fonts, media, trackers), load pages eagerly and cap renderer memory.
+Enable per platform with ZOMATO_LEAN_MODE / SWIGGY_LEAN_MODE (or BROWSER_LEAN_MODE for both).
+"""
+
+import os
+
+# URL patterns blocked through CDP Network.setBlockedURLs
+BLOCKED_URL_PATTERNS = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # Media
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    # Analytics / ads / trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clevertap*",
+    "*branch.io*", "*sentry.io*", "*newrelic.com*", "*nr-data.net*",
+]
+
+RENDERER_MEMORY_MB = int(os.getenv("LEAN_RENDERER_MEMORY_MB", "512"))
+
+
+def lean_enabled(platform):
+    """Per-platform switch, falling back to BROWSER_LEAN_MODE"""
+    default = os.getenv("BROWSER_LEAN_MODE", "false")
+    return os.getenv(f"{platform.upper()}_LEAN_MODE", default).lower() == "true"
+
+
+def apply_lean_options(chrome_options, renderer_memory_mb=RENDERER_MEMORY_MB):
+    """Add lean-mode prefs/flags to a selenium ChromeOptions before launch"""
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_setting_values.geolocation": 2,
+        "profile.default_content_setting_values.media_stream": 2,
+    })
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-remote-fonts")
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--renderer-process-limit=2")
+    chrome_options.add_argument(f"--js-flags=--max-old-space-size={renderer_memory_mb}")
+    return chrome_options
+
+
+def enable_request_blocking(driver, patterns=None):
+    """Block resource URLs at the network layer (needs a Chromium driver with CDP)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not enable request blocking: {e}")
+        return False
@@ -0,0 +1,186 @@
+"""
+Menu Catalogue - a local list of Mangaluru restaurants and dishes tagged with what they
+contain (sugar, maida, deep fried, fish, ...) and what they are good for (omega3,
+anti_inflammatory, ...). Every tag is a bit, so matching a medical profile is a few
+integer ANDs per dish, and the answer per (profile, meal size) is memoized.
+Gives app.py a shortlist for Claude to re-rank and a profile-respecting offline pick.
+"""
+
+import json
+import os
+import threading
+
+from recommendation_cache import normalize_profile
+
+CATALOG_PATH = os.getenv("MENU_CATALOG_PATH", "menu_catalog.json")
+
+# Mirrors the MANAGEMENT RULES in the Claude prompt: what each condition rules out / favours
+CONDITION_RULES = {
+    "diabetes": {"avoid": {"sugar", "white rice", "maida"}, "prefer": {"high_fiber"}},
+    "high bp": {"avoid": {"deep fried", "high salt", "processed meat"}, "prefer": set()},
+    "high cholesterol": {"avoid": {"deep fried", "processed meat"}, "prefer": {"omega3"}},
+    "obesity": {"avoid": {"deep fried", "sugar"}, "prefer": {"nutrient_dense", "low_calorie"}},
+    "asthma": {"avoid": set(), "prefer": {"anti_inflammatory"}},
+    "joint pain": {"avoid": set(), "prefer": {"anti_inflammatory", "omega3"}},
+}
+CONDITION_ALIASES = {
+    "diabetic": "diabetes", "bp": "high bp", "hypertension": "high bp", "heart": "high bp",
+    "cholesterol": "high cholesterol", "arthritis": "joint pain", "lung": "asthma", "copd": "asthma",
+}
+
+# Free-text restrictions ("No Salt", "avoid fried food") that mean something other than an ingredient
+RESTRICTION_ALIASES = {
+    "salt": {"high salt"}, "fried": {"deep fried"}, "fried food": {"deep fried"}, "deep fry": {"deep fried"},
+    "oil": {"deep fried"}, "seafood": {"fish", "shellfish"}, "prawns": {"prawn", "shellfish"},
+    "vegetarian": {"meat", "chicken", "fish", "shellfish", "egg"},
+    "veg": {"meat", "chicken", "fish", "shellfish", "egg"},
+    "non veg": {"meat", "chicken", "fish", "shellfish", "egg"},
+    "non-veg": {"meat", "chicken", "fish", "shellfish", "egg"},
+    "sweets": {"sugar"}, "milk": {"dairy"}, "ghee": {"dairy"}, "curd": {"dairy"},
+    "lactose": {"dairy"}, "lactose intolerant": {"dairy"}, "lactose intolerance": {"dairy"},
+}
+RESTRICTION_PREFIXES = ("no ", "avoid ", "without ", "zero ", "low ", "less ")
+
+
+class Query:
+    __slots__ = ("avoid", "prefer", "size", "unmapped")
+
+    def __init__(self, avoid, prefer, size, unmapped=()):
+        self.avoid = avoid      # bitmask of tags a dish must not have
+        self.prefer = prefer    # bitmask of tags that raise a dish's score
+        self.size = size        # "small" | "big"
+        self.unmapped = unmapped    # restrictions no catalogue tag covers
+
+
+class MenuCatalog:
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.location = "Mangaluru"
+        self._dishes = None
+        self._bits = {}         # tag -> bit
+        self._masks = []        # per dish: (tags bitmask, sizes)
+        self._memo = {}         # (profile key, size) -> ranked dish indices
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.matches = 0
+
+    def _load(self):
+        if self._dishes is not None:
+            return
+        with self._lock:
+            if self._dishes is not None:
+                return
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Menu catalogue unavailable ({e}); Claude will pick every dish")
+                data = {}
+            dishes = data.get("dishes", [])
+            for dish in dishes:
+                mask = 0
+                for tag in dish.get("contains", []) + dish.get("benefits", []):
+                    mask |= self._bit(tag.lower())
+                self._masks.append((mask, frozenset(dish.get("size") or ["small", "big"])))
+            self.location = data.get("location", self.location)
+            self._dishes = dishes
+
+    def _bit(self, tag):
+        if tag not in self._bits:
+            self._bits[tag] = 1 << len(self._bits)
+        return self._bits[tag]
+
+    def _mask(self, tags):
+        """Bitmask of the tags the catalogue knows about (unknown tags can't match anything)"""
+        mask = 0
+        for tag in tags:
+            mask |= self._bits.get(tag, 0)
+        return mask
+
+    def restriction_tags(self, restriction):
+        """'No Salt' -> {'high salt'}, 'peanuts' -> {'peanut'} if the catalogue knows it"""
+        text = " ".join(str(restriction).lower().split())
+        for prefix in RESTRICTION_PREFIXES:
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+                break
+        if text in RESTRICTION_ALIASES:
+            return RESTRICTION_ALIASES[text]
+        if text.endswith("s") and text not in self._bits and text[:-1] in self._bits:
+            text = text[:-1]
+        return {text} if text else set()
+
+    def query(self, profile, is_big_meal):
+        avoid, prefer = set(), set()
+        for condition in profile["conditions"]:
+            rules = CONDITION_RULES.get(CONDITION_ALIASES.get(condition, condition))
+            if rules:
+                avoid |= rules["avoid"]
+                prefer |= rules["prefer"]
+        unmapped = []
+        for restriction in profile["critical_restrictions"]:
+            tags = self.restriction_tags(restriction)
+            if not tags or any(tag not in self._bits for tag in tags):
+                unmapped.append(restriction)
+            avoid |= tags
+        return Query(self._mask(avoid), self._mask(prefer), "big" if is_big_meal else "small", unmapped)
+
+    def match(self, profile, is_big_meal, limit=5):
+        """
+        Dishes that break none of the profile's rules, best first (most preferred tags, then right size).
+        Empty if any restriction is something the catalogue doesn't tag ("no gluten"): it can't
+        vouch for those dishes, so Claude's open prompt or the fixed fallback decides instead.
+        """
+        self._load()
+        profile = normalize_profile(profile)
+        key = (json.dumps(profile, sort_keys=True), is_big_meal)
+        ranked = self._memo.get(key)
+        if ranked is None:
+            q = self.query(profile, is_big_meal)
+            if q.unmapped:
+                print(f"⚠️ Menu catalogue can't check {', '.join(q.unmapped)}; no local shortlist")
+            scored = []
+            for i, (mask, sizes) in enumerate(self._masks if not q.unmapped else []):
+                if mask & q.avoid:
+                    continue
+                scored.append((-bin(mask & q.prefer).count("1"), q.size not in sizes, i))
+            ranked = [i for _, _, i in sorted(scored)]
+            with self._lock:
+                self._memo[key] = ranked
+        self.lookups += 1
+        if ranked:
+            self.matches += 1
+        return [self._dishes[i] for i in ranked[:limit]]
+
+    def recommendation(self, profile, is_big_meal, source="catalog"):
+        """The top local match as a recommendation JSON string, or None if nothing fits"""
+        matches = self.match(profile, is_big_meal, limit=1)
+        if not matches:
+            return None
+        dish = matches[0]
+        return json.dumps({
+            "restaurant": dish["restaurant"],
+            "dish": dish["dish"],
+            "rationale": dish.get("notes") or "Matches the medical profile",
+            "source": source,
+        })
+
+    def invalidate(self):
+        """Forget memoized matches (after the catalogue file changes)"""
+        with self._lock:
+            self._dishes = None
+            self._bits = {}
+            self._masks = []
+            self._memo = {}
+
+    def stats(self):
+        return {
+            "dishes": len(self._dishes or []),
+            "tags": len(self._bits),
+            "memoized_profiles": len(self._memo),
+            "lookups": self.lookups,
+            "matched": self.matches,
+        }
+
+
+menu_catalog = MenuCatalog()
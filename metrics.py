@@ -0,0 +1,187 @@
+"""
+Metrics - counters, latency histograms and per-order timing traces for the
+detect -> recommend -> order pipeline. Served as JSON at /metrics.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000]
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": {
+                (f"le_{b}" if i < len(BUCKETS_MS) else "inf"): c
+                for i, (b, c) in enumerate(zip(BUCKETS_MS + [None], self.counts))
+            },
+        }
+
+
+class OrderTrace:
+    def __init__(self, order_id, started_at=None):
+        self.order_id = order_id
+        self.started_at = started_at or time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration, ok):
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "offset_ms": round((start - self.started_at) * 1000, 1),
+                "duration_ms": round(duration * 1000, 1),
+                "ok": ok,
+            })
+
+    def to_dict(self):
+        with self._lock:
+            return {"order_id": self.order_id, "started_at": self.started_at, "spans": list(self.spans)}
+
+
+class Metrics:
+    def __init__(self, max_traces=500):
+        self.started_at = time.time()
+        self.max_traces = max_traces
+        self._counters = defaultdict(int)
+        self._histograms = defaultdict(Histogram)
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name, seconds, ok=True, start=None):
+        """Record a latency sample, and a span on the current thread's order trace if there is one"""
+        with self._lock:
+            self._histograms[name].observe(seconds * 1000)
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            trace.add(name, start if start is not None else time.time() - seconds, seconds, ok)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.time()
+        t = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - t, ok, start)
+
+    def timed(self, name):
+        """Decorator: time every call; returning False (or raising) marks the span as failed"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.time()
+                t = time.perf_counter()
+                ok = False
+                try:
+                    result = fn(*args, **kwargs)
+                    ok = result is not False
+                    return result
+                finally:
+                    self.observe(name, time.perf_counter() - t, ok, start)
+                    if not ok:
+                        self.inc(f"{name}_failures")
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def order_trace(self, order_id, started_at=None):
+        """Attach spans recorded on this thread to order_id's trace"""
+        trace = self.start_trace(order_id, started_at)
+        previous = getattr(self._local, "trace", None)
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+
+    def start_trace(self, order_id, started_at=None):
+        with self._lock:
+            trace = self._traces.get(order_id)
+            if trace is None:
+                trace = self._traces[order_id] = OrderTrace(order_id, started_at)
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            return trace
+
+    def current_trace(self):
+        return getattr(self._local, "trace", None)
+
+    def bind(self, fn, trace=None):
+        """Wrap fn so it records into `trace` (default: this thread's) when run on another thread"""
+        trace = trace or self.current_trace()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            previous = getattr(self._local, "trace", None)
+            self._local.trace = trace
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.trace = previous
+        return wrapper
+
+    def get_trace(self, order_id):
+        with self._lock:
+            trace = self._traces.get(order_id)
+        return trace.to_dict() if trace else None
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {name: h.to_dict() for name, h in self._histograms.items()}
+            traces = len(self._traces)
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "counters": counters,
+            "latency": histograms,
+            "order_traces": traces,
+        }
+
+
+metrics = Metrics()
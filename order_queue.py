@@ -0,0 +1,145 @@
+"""
+Background Order Queue - runs the recommend -> browser -> cart -> checkout pipeline
+on worker threads so /detect can answer the ESP32 straight away.
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Stages a job moves through, in order
+STAGES = ["queued", "recommend", "browser", "cart", "checkout", "done"]
+
+
+class OrderJob:
+    def __init__(self, payload, key=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.payload = payload
+        self.key = key              # coalescing key (one active job per key)
+        self.triggers = 1           # growl triggers served by this job
+        self.status = "queued"      # queued | running | completed | failed
+        self.stage = "queued"
+        self.order = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.history = [{"stage": "queued", "at": self.created_at}]
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage):
+        """Record that the job has entered a new pipeline stage"""
+        with self._lock:
+            now = time.time()
+            self.stage = stage
+            self.updated_at = now
+            self.history.append({"stage": stage, "at": now})
+
+    def finish(self, success, error=None):
+        with self._lock:
+            self.status = "completed" if success else "failed"
+            self.error = error
+            self.stage = "done"
+            self.updated_at = time.time()
+            self.history.append({"stage": "done", "at": self.updated_at})
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "order_id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "order": self.order,
+                "error": self.error,
+                "created_at": self.created_at,
+                "updated_at": self.updated_at,
+                "triggers": self.triggers,
+                "history": list(self.history),
+            }
+
+
+class OrderQueue:
+    def __init__(self, handler, workers=2, max_jobs=500):
+        """
+        handler: callable(job) -> bool, runs the full order pipeline for one job
+        workers: number of worker threads
+        max_jobs: how many jobs to remember for the status endpoint
+        """
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._active = {}           # coalescing key -> queued/running job
+        self._lock = threading.Lock()
+        self._threads = []
+        self.coalesced = 0
+
+    def start(self):
+        """Start worker threads (safe to call more than once)"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"order-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, key=None, **payload):
+        """
+        Queue a new order job and return it immediately.
+        If a job with the same key is still queued or running, no new job is made:
+        that job is returned so every concurrent trigger shares one order.
+        """
+        self.start()
+        with self._lock:
+            if key is not None:
+                active = self._active.get(key)
+                if active is not None:
+                    with active._lock:
+                        active.triggers += 1
+                    self.coalesced += 1
+                    return active
+            job = OrderJob(payload, key)
+            if key is not None:
+                self._active[key] = job
+            self._jobs[job.id] = job
+            self._trim()
+        self._queue.put(job)
+        return job
+
+    def get(self, order_id):
+        with self._lock:
+            return self._jobs.get(order_id)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _trim(self):
+        # Forget the oldest finished jobs once we're over the limit
+        while len(self._jobs) > self.max_jobs:
+            for job_id, job in self._jobs.items():
+                if job.status in ("completed", "failed"):
+                    del self._jobs[job_id]
+                    break
+            else:
+                return
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                with job._lock:
+                    job.status = "running"
+                success = self.handler(job)
+                job.finish(bool(success))
+            except Exception as e:
+                print(f"❌ Order job {job.id} crashed: {e}")
+                job.finish(False, error=str(e))
+            finally:
+                if job.key is not None:
+                    with self._lock:
+                        if self._active.get(job.key) is job:
+                            del self._active[job.key]
+                self._queue.task_done()
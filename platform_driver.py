@@ -0,0 +1,456 @@
+"""
+Platform Driver - the one login -> search -> add -> checkout flow shared by every food
+platform. A platform is a table (see zomato_automation.py / swiggy_automation.py): its
+home page and, for each flow step, ranked alternative locators.
+
+All of a step's locators are probed together in one script call per poll, so a broken
+hashed class name costs one extra lookup rather than a 20 s timeout. Once the page has
+settled, a step that matches none of its locators fails after SELECTOR_GRACE seconds.
+The locator that worked is remembered (restaurant index) and preferred next time.
+WARNING: This is for educational purposes. Using automation may violate Terms of Service.
+"""
+
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException
+from session_store import save_session, restore_session, clear_session
+from waits import OrderDeadline, OrderCancelled, page_ready, wait_for_page_ready, POLL_INTERVAL
+from lean_mode import lean_enabled, apply_lean_options, enable_request_blocking
+from restaurant_index import restaurant_index, stable_xpath
+from metrics import metrics
+
+OTP_TIMEOUT = int(os.getenv("OTP_TIMEOUT", "60"))
+SELECTOR_GRACE = float(os.getenv("SELECTOR_GRACE", "2"))
+
+# For each [by, value] locator: [match count, first element meeting `need` or null]
+_PROBE_JS = """
+var locators = arguments[0], need = arguments[1], out = [];
+function usable(el) {
+    if (need === 'present') return true;
+    var visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return visible && (need === 'visible' || !el.disabled);
+}
+for (var i = 0; i < locators.length; i++) {
+    var by = locators[i][0], value = locators[i][1], els = [];
+    try {
+        if (by === 'xpath') {
+            var r = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < r.snapshotLength; j++) els.push(r.snapshotItem(j));
+        } else if (by === 'id') {
+            var el = document.getElementById(value);
+            if (el) els.push(el);
+        } else {
+            els = Array.prototype.slice.call(document.querySelectorAll(value));
+        }
+    } catch (e) {}
+    var hit = null;
+    for (var k = 0; k < els.length && !hit; k++) if (usable(els[k])) hit = els[k];
+    out.push([els.length, hit]);
+}
+return out;
+"""
+
+
+# Locator types _PROBE_JS understands
+SUPPORTED_BY = (By.XPATH, By.ID, By.CSS_SELECTOR)
+
+
+class StepNotFound(Exception):
+    pass
+
+
+class PlatformDriver:
+    TABLE = None    # set by each platform: {"name", "home", "steps": {step: {"budget", "locators"}}, ...}
+
+    def __init_subclass__(cls, **kwargs):
+        """Check a platform's selector table when its class is defined"""
+        super().__init_subclass__(**kwargs)
+        for step, spec in (cls.TABLE or {}).get("steps", {}).items():
+            for by, _ in spec["locators"]:
+                if by not in SUPPORTED_BY:
+                    raise ValueError(f"{cls.TABLE['name']} '{step}': unsupported locator type '{by}' "
+                                     f"(use {', '.join(SUPPORTED_BY)})")
+
+    def __init__(self, headless=False, driver=None, lean=None, index=None):
+        """
+        driver: an already-running WebDriver (e.g. from BrowserPool); it is left open after auto_order
+        lean: block images/fonts/media/trackers (defaults to <PLATFORM>_LEAN_MODE)
+        index: RestaurantIndex used to deep-link repeat orders and remember locators (defaults to the shared one)
+        """
+        self.platform = self.TABLE["name"]
+        if lean is None:
+            lean = lean_enabled(self.platform)
+        self.owns_driver = driver is None
+        self.driver = driver or self.create_driver(headless, lean)
+        self.cancelled = threading.Event()
+        self.deadline = OrderDeadline(cancelled=self.cancelled)
+        self.place_order_button = None
+        self.logged_in = False
+        self.index = index or restaurant_index
+        self.restaurant_url = None
+        self.deep_linked = False
+        self.location = "Mangaluru"
+
+    @classmethod
+    def create_driver(cls, headless=False, lean=False):
+        """Launch a new Chrome WebDriver with our anti-automation options (plus lean mode if asked)"""
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        for name, value in cls.TABLE.get("chrome_options", {}).items():
+            chrome_options.add_experimental_option(name, value)
+        if lean:
+            apply_lean_options(chrome_options)
+
+        driver = webdriver.Chrome(options=chrome_options)
+        if lean:
+            enable_request_blocking(driver)
+        return driver
+
+    # --- locating ---------------------------------------------------------------
+
+    def ranked(self, step):
+        """The step's locator templates, the one that worked last time first"""
+        locators = [tuple(l) for l in self.TABLE["steps"][step]["locators"]]
+        remembered = self.index.get_selector(self.platform, step)
+        if remembered in locators:
+            locators.remove(remembered)
+            locators.insert(0, remembered)
+        return locators
+
+    def match(self, templates, need="present", **params):
+        """One look for all templates at once -> (template, element, count) of the best match, or None"""
+        found = self.driver.execute_script(
+            _PROBE_JS, [[by, fill(by, value, params)] for by, value in templates], need
+        )
+        for template, (count, element) in zip(templates, found):
+            if element is not None:
+                return template, element, count
+        return None
+
+    def probe(self, step, need="present", **params):
+        return self.match(self.ranked(step), need, **params)
+
+    def find(self, step, need="clickable", settle=0, **params):
+        """
+        Wait for the step's first usable locator match within the step budget.
+        settle: also wait until that locator's match count has stopped changing (result lists)
+        Raises StepNotFound early once the page is ready but nothing matches for SELECTOR_GRACE.
+        """
+        budget = self.TABLE["steps"][step].get("budget", step)
+        template, element = self.wait_for(self.ranked(step), need, budget, step, settle, **params)
+        self.remember(step, template)
+        return element
+
+    def wait_for(self, templates, need, budget, label, settle=0, limit=None, **params):
+        """Poll match() until it succeeds (-> (template, element)) or fail with StepNotFound"""
+        give_up = time.time() + min(self.deadline.budget(budget), limit or float("inf"))
+        ready_since = None
+        count_seen = (None, 0, 0.0)     # (template, count, since)
+        while True:
+            found = self.match(templates, need, **params)
+            now = time.time()
+            if found is not None:
+                template, element, count = found
+                if settle and (count_seen[0] != template or count_seen[1] != count):
+                    count_seen = (template, count, now)
+                elif not settle or now - count_seen[2] >= settle:
+                    return template, element
+            elif page_ready(self.driver):
+                ready_since = ready_since or now
+                if now - ready_since >= SELECTOR_GRACE:
+                    metrics.inc("selector_misses")
+                    raise StepNotFound(f"{self.platform} '{label}': none of {len(templates)} locators matched")
+            else:
+                ready_since = None
+            if now >= give_up:
+                metrics.inc("selector_misses")
+                raise StepNotFound(f"{self.platform} '{label}' not found within its budget")
+            time.sleep(POLL_INTERVAL)
+            self.deadline.budget(budget)     # raises once cancelled or out of time
+
+    def remember(self, step, template):
+        if template != tuple(self.TABLE["steps"][step]["locators"][0]):
+            metrics.inc("selector_fallbacks")
+        self.index.remember_selector(self.platform, step, template)
+
+    def click(self, step, **params):
+        """Find and click a step's element, re-finding it once if the page re-rendered it"""
+        for attempt in (1, 2):
+            element = self.find(step, "clickable", **params)
+            try:
+                element.click()
+                return element
+            except (StaleElementReferenceException, ElementClickInterceptedException):
+                if attempt == 2:
+                    raise
+
+    def type_into(self, step, text, clear=False):
+        element = self.find(step, "present")
+        if clear:
+            element.clear()
+        element.send_keys(text)
+        return element
+
+    def cancel(self):
+        """Stop a running flow at its next step (used when another platform wins a race)"""
+        self.cancelled.set()
+
+    # --- flow -------------------------------------------------------------------
+
+    def is_logged_in(self, wait=5):
+        """
+        Logged in only if the account menu shows; a missing login link alone (slow page,
+        broken selector) isn't proof. Undecided after wait seconds counts as logged out.
+        """
+        give_up = time.time() + wait
+        try:
+            wait_for_page_ready(self.driver, wait)
+            while True:
+                if self.probe("account_menu") is not None:
+                    return True
+                if self.probe("login_link") is not None:
+                    return False
+                if time.time() >= give_up:
+                    print(f"⚠️ {self.platform}: neither the account menu nor the login link showed; assuming logged out")
+                    return False
+                time.sleep(POLL_INTERVAL)
+        except Exception:
+            return False
+
+    def login(self, phone_number):
+        """Log in with the phone number; reuses a still-valid saved session, else waits for a manual OTP"""
+        with metrics.timer(f"{self.platform}_login"):
+            return self._login(phone_number)
+
+    def _login(self, phone_number):
+        home = self.TABLE["home"]
+        print(f"🔐 Logging into {self.platform.capitalize()}...")
+        self.driver.get(home)
+
+        # Pooled browsers keep their cookies, saved sessions survive restarts
+        if self.is_logged_in() or (restore_session(self.driver, self.platform, home) and self.is_logged_in()):
+            self.logged_in = True
+            print("✅ Already logged in, skipping OTP")
+            return True
+        clear_session(self.platform)
+
+        try:
+            self.click("login_link")
+            self.type_into("phone_input", phone_number)
+            self.click("continue_button")
+
+            print("⏳ Please enter OTP manually in the browser window...")
+            print(f"⏳ Waiting up to {OTP_TIMEOUT} seconds for you to complete login...")
+            # Wait for manual OTP entry, moving on as soon as the account menu appears
+            give_up = time.time() + OTP_TIMEOUT
+            while self.probe("account_menu") is None:
+                if time.time() >= give_up:
+                    raise TimeoutError(f"no OTP entered within {OTP_TIMEOUT}s")
+                if self.cancelled.wait(2):
+                    raise OrderCancelled("Order cancelled while waiting for the OTP")
+
+            self.logged_in = True
+            save_session(self.driver, self.platform)
+            print("✅ Login successful!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Login failed: {e}")
+            return False
+
+    def open_indexed_restaurant(self, restaurant_name, location):
+        """Deep-link to a menu page resolved on an earlier run; False if not indexed or stale"""
+        url = self.index.get_restaurant_url(self.platform, location, restaurant_name)
+        if not url:
+            return False
+
+        print(f"⚡ Opening indexed menu page for {restaurant_name}")
+        try:
+            self.driver.get(url)
+            wait_for_page_ready(self.driver, self.deadline.budget("restaurant"))
+            if self.driver.current_url.startswith(url.rstrip("/")) and self.probe("menu_item") is not None:
+                self.restaurant_url = url
+                self.deep_linked = True
+                return True
+        except Exception as e:
+            print(f"❌ Indexed menu page failed: {e}")
+
+        print("♻️ Indexed URL is stale, falling back to search")
+        self.index.invalidate_restaurant(self.platform, location, restaurant_name)
+        return False
+
+    def search_restaurant(self, restaurant_name, location="Mangaluru"):
+        """Open the restaurant's menu page (indexed deep link, else location -> search -> result)"""
+        with metrics.timer(f"{self.platform}_search_restaurant"):
+            print(f"🔍 Searching for {restaurant_name} in {location}...")
+            self.location = location
+
+            if self.open_indexed_restaurant(restaurant_name, location):
+                print(f"✅ Found {restaurant_name} (indexed)")
+                return True
+
+            try:
+                self.type_into("location_input", location, clear=True)
+                # First suggestion once the list has filled in
+                self.find("location_suggestion", "visible", settle=0.3).click()
+                wait_for_page_ready(self.driver, self.deadline.budget("location"))
+
+                self.type_into("search_input", restaurant_name)
+                # Restaurant once the results have settled
+                self.find("restaurant_result", "visible", settle=0.3, **restaurant_params(restaurant_name)).click()
+                wait_for_page_ready(self.driver, self.deadline.budget("restaurant"))
+
+                # Remember the menu page so the next order can skip the search funnel
+                self.restaurant_url = self.driver.current_url
+                self.index.remember_restaurant(self.platform, location, restaurant_name, self.restaurant_url)
+
+                print(f"✅ Found {restaurant_name}")
+                return True
+
+            except Exception as e:
+                print(f"❌ Restaurant search failed: {e}")
+                return False
+
+    def click_add_button(self, dish_name):
+        """Click the dish's ADD button, trying the indexed locator before the table's"""
+        cached = self.index.get_dish_locator(self.platform, self.restaurant_url, dish_name) if self.restaurant_url else None
+        if cached:
+            try:
+                self.wait_for([(By.XPATH, cached)], "clickable", "add_to_cart", "indexed add_button", limit=3)[1].click()
+                return
+            except Exception:
+                self.index.invalidate_dish(self.platform, self.restaurant_url, dish_name)
+
+        add_button = self.click("add_button", dish=dish_name)
+        template = self.ranked("add_button")[0]
+        if self.restaurant_url and template[0] == By.XPATH:
+            self.index.remember_dish(self.platform, self.restaurant_url, dish_name,
+                                     stable_xpath(add_button, fill(By.XPATH, template[1], {"dish": dish_name})))
+
+    def add_to_cart(self, dish_name, restaurant_name=None):
+        """Add a dish to cart"""
+        with metrics.timer(f"{self.platform}_add_to_cart"):
+            print(f"🍽️ Adding {dish_name} to cart...")
+            try:
+                self.click_add_button(dish_name)
+                wait_for_page_ready(self.driver, self.deadline.budget("add_to_cart"))
+                print(f"✅ {dish_name} added to cart")
+                return True
+
+            except Exception as e:
+                print(f"❌ Failed to add dish: {e}")
+                # A deep-linked page without the dish may be the wrong page - search next time
+                if self.deep_linked and restaurant_name:
+                    self.index.invalidate_restaurant(self.platform, self.location, restaurant_name)
+                return False
+
+    def place_order(self, address_index=0, commit=True):
+        """
+        Go from the menu to the ready-to-pay page
+        address_index: Which saved address to use (0 = first address)
+        commit: False stops there; call commit_order() to finish
+        """
+        with metrics.timer(f"{self.platform}_place_order"):
+            print("📦 Placing order...")
+            try:
+                self.click("view_cart")
+                wait_for_page_ready(self.driver, self.deadline.budget("cart"))
+                self.click("checkout")
+                wait_for_page_ready(self.driver, self.deadline.budget("checkout"))
+                # Select address (use first saved address)
+                # This part varies based on your saved addresses
+                self.place_order_button = self.find("place_order")
+
+            except Exception as e:
+                print(f"❌ Order placement failed: {e}")
+                return False
+
+        if not commit:
+            print(f"⏸️ {self.platform.capitalize()} is ready to pay, waiting for commit")
+            return True
+        return self.commit_order()
+
+    def commit_order(self):
+        """Click Place Order on the ready-to-pay page reached by place_order()"""
+        if self.place_order_button is None:
+            print(f"❌ {self.platform.capitalize()} is not at the ready-to-pay page")
+            return False
+
+        print("⚠️ READY TO PLACE ORDER!")
+        print("⚠️ Uncomment the next line to actually place the order")
+        # self.place_order_button.click()  # UNCOMMENT THIS TO ACTUALLY ORDER
+
+        print("✅ Order would be placed here (currently disabled for safety)")
+        return True
+
+    def auto_order(self, restaurant_name, dish_name, phone_number, location="Mangaluru", on_stage=None, commit=True):
+        """
+        Complete automatic ordering flow
+        on_stage: optional callback(stage) used to report cart/checkout progress
+        commit: False stops at the ready-to-pay page (see commit_order)
+        """
+        if on_stage is None:
+            on_stage = lambda stage: None
+        try:
+            if not self.login(phone_number):
+                return False
+
+            # Everything after login shares one deadline
+            self.deadline = OrderDeadline(cancelled=self.cancelled)
+
+            if not self.search_restaurant(restaurant_name, location):
+                return False
+
+            on_stage("cart")
+            if not self.add_to_cart(dish_name, restaurant_name):
+                return False
+
+            on_stage("checkout")
+            if not self.place_order(commit=commit):
+                return False
+
+            print("🎉 Order completed successfully!" if commit else f"🏁 {self.platform.capitalize()} reached checkout")
+            return True
+
+        except Exception as e:
+            print(f"❌ Auto-order failed: {e}")
+            return False
+        finally:
+            # Pooled drivers go back to the pool instead of being quit
+            if self.owns_driver:
+                time.sleep(5)
+                self.driver.quit()
+
+
+def xpath_literal(value):
+    """value as an XPath string literal, quotes and all ("Giri Manja's" can't go inside '...')"""
+    value = str(value)
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def fill(by, template, params):
+    """Locator value with its placeholders filled; XPath ones become quoted literals"""
+    if by == By.XPATH:
+        params = {name: xpath_literal(value) for name, value in params.items()}
+    return template.format(**params)
+
+
+def restaurant_params(restaurant_name):
+    """Placeholders restaurant_result locators may use (unquoted in the table: fill() quotes them)"""
+    return {
+        "restaurant": restaurant_name,
+        "restaurant_lower": restaurant_name.lower(),
+        "restaurant_slug": "-".join(restaurant_name.lower().split()),
+    }
@@ -0,0 +1,145 @@
+"""
+Platform Race - drives several ordering platforms at once for the same dish and commits
+the first one that reaches the ready-to-pay page straight away; the others are cancelled.
+Per-platform wins and time-to-checkout are recorded so FOOD_PLATFORM can be tuned from data.
+"""
+
+import json
+import os
+import queue
+import statistics
+import threading
+import time
+
+RACE_STATS_PATH = os.getenv("RACE_STATS_PATH", "race_stats.json")
+LATENCY_SAMPLES = 100
+
+
+class RaceEntrant:
+    def __init__(self, name, prepare, commit, cancel, release=None):
+        """
+        prepare: callable() -> bool, runs the flow up to the ready-to-pay page
+        commit: callable() -> bool, places the prepared order
+        cancel: callable(), makes a running prepare() give up at its next step
+        release: optional callable(), frees the entrant's browser once it is done with it
+        """
+        self.name = name
+        self.prepare = prepare
+        self.commit = commit
+        self.cancel = cancel
+        self.release = release
+
+
+class RaceStats:
+    def __init__(self, path=RACE_STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    def record(self, name, outcome, latency=None):
+        """outcome: "win", "lost" (reached checkout second), "failed" or "cancelled" """
+        with self._lock:
+            entry = self._data.setdefault(name, {"races": 0, "win": 0, "lost": 0, "failed": 0, "cancelled": 0, "latencies": []})
+            entry["races"] += 1
+            entry[outcome] += 1
+            if latency is not None:
+                entry["latencies"] = (entry["latencies"] + [round(latency, 2)])[-LATENCY_SAMPLES:]
+            try:
+                tmp = self.path + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self._data, f, indent=2)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"⚠️ Could not save race stats: {e}")
+
+    def summary(self):
+        with self._lock:
+            result = {}
+            for name, entry in self._data.items():
+                latencies = entry["latencies"]
+                result[name] = {
+                    "races": entry["races"],
+                    "wins": entry["win"],
+                    "win_rate": round(entry["win"] / entry["races"], 3) if entry["races"] else 0,
+                    "failed": entry["failed"],
+                    "checkout_p50_s": statistics.median(latencies) if latencies else None,
+                    "checkout_max_s": max(latencies) if latencies else None,
+                }
+            return result
+
+
+race_stats = RaceStats()
+
+
+def race(entrants, timeout=None, stats=race_stats):
+    """
+    Run every entrant's prepare() in parallel and commit the first that succeeds as soon as
+    it does. The others are cancelled and unwind (then release) on their own threads.
+    Returns (winner_name or None, committed_ok).
+    """
+    results = queue.Queue()
+    started = time.time()
+    lock = threading.Lock()
+    decided = []        # the winner, or None once the race has timed out
+
+    def run(entrant):
+        try:
+            ok = bool(entrant.prepare())
+        except Exception as e:
+            print(f"❌ {entrant.name} crashed in race: {e}")
+            ok = False
+        latency = time.time() - started
+        with lock:
+            won = ok and not decided
+            if won:
+                decided.append(entrant)
+        if won:
+            stats.record(entrant.name, "win", latency)
+            print(f"🏆 {entrant.name} reached checkout first ({latency:.1f}s)")
+            for other in entrants:
+                if other is not entrant:
+                    other.cancel()
+            results.put(entrant)    # committed and released by race() itself
+            return
+        if ok:
+            stats.record(entrant.name, "lost", latency)
+        else:
+            stats.record(entrant.name, "cancelled" if decided else "failed")
+        results.put(None)
+        if entrant.release:
+            entrant.release()
+
+    for entrant in entrants:
+        threading.Thread(target=run, args=(entrant,), name=f"race-{entrant.name}", daemon=True).start()
+
+    winner = None
+    finished = 0
+    deadline = started + timeout if timeout else None
+    while winner is None and finished < len(entrants):
+        wait = None if deadline is None else max(0, deadline - time.time())
+        try:
+            winner = results.get(timeout=wait)
+        except queue.Empty:
+            break
+        finished += 1
+
+    if winner is None:
+        with lock:
+            if decided:
+                winner = decided[0]     # won just as the race timed out
+            else:
+                decided.append(None)
+    if winner is None:
+        for entrant in entrants:
+            entrant.cancel()
+        print("❌ No platform reached checkout")
+        return None, False
+    try:
+        return winner.name, bool(winner.commit())
+    finally:
+        if winner.release:
+            winner.release()
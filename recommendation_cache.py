@@ -0,0 +1,93 @@
+"""
+Recommendation Cache - keeps Claude's meal picks per (medical profile, meal size)
+so a warm trigger never has to wait on the API.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_profile(profile):
+    """Lowercase, strip and sort the profile so equivalent profiles hash the same"""
+    def clean(items):
+        return sorted({str(i).strip().lower() for i in items or [] if str(i).strip()})
+
+    return {
+        "conditions": clean(profile.get("conditions")),
+        "critical_restrictions": clean(profile.get("critical_restrictions")),
+        "health_goals": str(profile.get("health_goals") or "").strip().lower(),
+    }
+
+
+class RecommendationCache:
+    def __init__(self, ttl=6 * 3600, max_entries=256, variety=1):
+        """
+        ttl: seconds a recommendation stays valid
+        max_entries: number of (profile, meal size) keys kept before LRU eviction
+        variety: how many different recommendations to rotate through per key
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.variety = max(1, variety)
+        self._entries = OrderedDict()   # key -> {"items": [(value, stored_at)], "next": int, "saturated": bool}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(profile, is_big_meal):
+        payload = json.dumps([normalize_profile(profile), bool(is_big_meal)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the next cached recommendation for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = time.time()
+                fresh = [(v, t) for v, t in entry["items"] if now - t < self.ttl]
+                if len(fresh) < len(entry["items"]):
+                    entry["saturated"] = False      # room again: worth asking for another
+                entry["items"] = fresh
+                if not entry["items"]:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            value, _ = entry["items"][entry["next"] % len(entry["items"])]
+            entry["next"] += 1
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            entry = self._entries.setdefault(key, {"items": [], "next": 0, "saturated": False})
+            if value not in [v for v, _ in entry["items"]]:
+                entry["items"].append((value, time.time()))
+                entry["items"] = entry["items"][-self.variety:]
+            else:
+                # A refill came back with a dish we already have: stop asking until one expires
+                entry["saturated"] = True
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def wants_more(self, key):
+        """True if the key has fewer than `variety` fresh recommendations and refills still find new ones"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is None or (len(entry["items"]) < self.variety and not entry["saturated"])
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"keys": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,123 @@
+"""
+Restaurant Index - remembers where a restaurant's menu page lives and which locator
+found a dish (or a flow step), so repeat orders deep-link straight to the menu instead
+of going through the location -> search -> results funnel again.
+Entries are filled in on successful runs and dropped when navigation fails.
+"""
+
+import json
+import os
+import threading
+import time
+
+INDEX_PATH = os.getenv("RESTAURANT_INDEX_PATH", "restaurant_index.json")
+
+
+def normalize(text):
+    return " ".join(str(text or "").lower().split())
+
+
+class RestaurantIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+            self._data.setdefault("restaurants", {})
+            self._data.setdefault("dishes", {})
+            self._data.setdefault("selectors", {})
+        return self._data
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def restaurant_key(platform, location, restaurant):
+        return "|".join([normalize(platform), normalize(location), normalize(restaurant)])
+
+    @staticmethod
+    def dish_key(platform, restaurant_url, dish):
+        return "|".join([normalize(platform), restaurant_url, normalize(dish)])
+
+    def get_restaurant_url(self, platform, location, restaurant):
+        with self._lock:
+            entry = self._load()["restaurants"].get(self.restaurant_key(platform, location, restaurant))
+            return entry["url"] if entry else None
+
+    def remember_restaurant(self, platform, location, restaurant, url):
+        with self._lock:
+            self._load()["restaurants"][self.restaurant_key(platform, location, restaurant)] = {
+                "url": url,
+                "resolved_at": time.time(),
+            }
+            self._save()
+
+    def invalidate_restaurant(self, platform, location, restaurant):
+        """Forget a restaurant URL and every dish locator recorded on that page"""
+        with self._lock:
+            data = self._load()
+            entry = data["restaurants"].pop(self.restaurant_key(platform, location, restaurant), None)
+            if entry:
+                prefix = "|".join([normalize(platform), entry["url"]]) + "|"
+                for key in [k for k in data["dishes"] if k.startswith(prefix)]:
+                    del data["dishes"][key]
+                self._save()
+
+    def get_dish_locator(self, platform, restaurant_url, dish):
+        with self._lock:
+            entry = self._load()["dishes"].get(self.dish_key(platform, restaurant_url, dish))
+            return entry["xpath"] if entry else None
+
+    def remember_dish(self, platform, restaurant_url, dish, xpath):
+        with self._lock:
+            self._load()["dishes"][self.dish_key(platform, restaurant_url, dish)] = {
+                "xpath": xpath,
+                "resolved_at": time.time(),
+            }
+            self._save()
+
+    def invalidate_dish(self, platform, restaurant_url, dish):
+        with self._lock:
+            if self._load()["dishes"].pop(self.dish_key(platform, restaurant_url, dish), None):
+                self._save()
+
+    def get_selector(self, platform, step):
+        """Locator (by, template) that last found this flow step, or None"""
+        with self._lock:
+            entry = self._load()["selectors"].get(f"{normalize(platform)}|{step}")
+            return tuple(entry["locator"]) if entry else None
+
+    def remember_selector(self, platform, step, locator):
+        with self._lock:
+            key = f"{normalize(platform)}|{step}"
+            selectors = self._load()["selectors"]
+            if selectors.get(key, {}).get("locator") == list(locator):
+                return
+            selectors[key] = {"locator": list(locator), "resolved_at": time.time()}
+            self._save()
+
+
+def stable_xpath(element, fallback):
+    """Prefer an id/data-testid locator for a found element, else keep the xpath that found it"""
+    try:
+        for attr in ("id", "data-testid"):
+            value = element.get_attribute(attr)
+            if value and "'" not in value:
+                return f"//*[@{attr}='{value}']"
+    except Exception:
+        pass
+    return fallback
+
+
+# Shared by both automation bots
+restaurant_index = RestaurantIndex()
@@ -0,0 +1,80 @@
+"""
+Session Store - saves cookies + localStorage after a successful Zomato/Swiggy login
+and restores them on later runs, so the OTP login only happens when the session expires.
+WARNING: The saved files are live login credentials. Keep SESSION_DIR private.
+"""
+
+import json
+import os
+import time
+
+SESSION_DIR = os.getenv("SESSION_DIR", "sessions")
+
+
+def session_path(platform):
+    return os.path.join(SESSION_DIR, f"{platform}.json")
+
+
+def save_session(driver, platform):
+    """Write the browser's cookies and localStorage for the current site to disk"""
+    try:
+        data = {
+            "saved_at": time.time(),
+            "url": driver.current_url,
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(
+                "var d = {}; for (var i = 0; i < localStorage.length; i++) {"
+                " var k = localStorage.key(i); d[k] = localStorage.getItem(k); } return d;"
+            ) or {},
+        }
+        os.makedirs(SESSION_DIR, exist_ok=True)
+        tmp = session_path(platform) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, session_path(platform))
+        print(f"💾 Saved {platform} session")
+        return True
+    except Exception as e:
+        print(f"❌ Could not save {platform} session: {e}")
+        return False
+
+
+def restore_session(driver, platform, home_url):
+    """
+    Load saved cookies/localStorage into the browser and reload home_url.
+    Returns False if there is nothing saved (the caller still has to probe the login).
+    """
+    path = session_path(platform)
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+
+        # Cookies can only be set for the domain that is currently open
+        if not driver.current_url.startswith(home_url):
+            driver.get(home_url)
+        for cookie in data.get("cookies", []):
+            if cookie.get("expiry") and cookie["expiry"] < time.time():
+                continue
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                pass
+        for key, value in data.get("local_storage", {}).items():
+            driver.execute_script("localStorage.setItem(arguments[0], arguments[1]);", key, value)
+
+        driver.get(home_url)
+        print(f"🔁 Restored saved {platform} session")
+        return True
+    except Exception as e:
+        print(f"❌ Could not restore {platform} session: {e}")
+        return False
+
+
+def clear_session(platform):
+    try:
+        os.remove(session_path(platform))
+    except OSError:
+        pass
@@ -0,0 +1,62 @@
+"""
+Single Flight - at most one call per key runs at a time; callers that arrive while it
+is running wait for it and get the same result (or exception) instead of repeating it.
+Used so concurrent cache misses share one Claude call.
+"""
+
+import threading
+
+
+class Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}      # key -> Flight
+        self._lock = threading.Lock()
+        self.calls = 0          # fn actually ran
+        self.shared = 0         # callers served by someone else's call
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) for key, or join the call already running for it"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+                self.calls += 1
+            else:
+                flight.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._flights
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
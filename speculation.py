@@ -0,0 +1,91 @@
+"""
+Speculative Prefetch - starts the recommendation call in the background when a device
+is one growl away from ordering, so the threshold growl can use a finished (or in-flight)
+result instead of paying the full LLM latency at the hungriest moment.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Speculation:
+    __slots__ = ("future", "is_big_meal", "expires_at")
+
+    def __init__(self, future, is_big_meal, expires_at):
+        self.future = future
+        self.is_big_meal = is_big_meal
+        self.expires_at = expires_at
+
+
+class SpeculativePrefetcher:
+    def __init__(self, fetch, workers=4):
+        """
+        fetch: callable(is_big_meal) -> recommendation JSON string
+        workers: max speculative calls running at once
+        """
+        self.fetch = fetch
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculate")
+        self._pending = {}      # device_id -> Speculation
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0           # trigger found a speculation to use
+        self.misses = 0         # trigger had nothing speculated
+        self.wasted = 0         # speculation thrown away (stale, wrong meal size, profile change)
+
+    def maybe_start(self, device_id, is_big_meal, expires_at, now):
+        """Start a speculative fetch for a device unless a fresh one is already pending"""
+        with self._lock:
+            current = self._pending.get(device_id)
+            if current is not None:
+                if current.expires_at > now and current.is_big_meal == is_big_meal:
+                    current.expires_at = max(current.expires_at, expires_at)
+                    return False
+                self.wasted += 1
+            future = self._executor.submit(self.fetch, is_big_meal)
+            self._pending[device_id] = Speculation(future, is_big_meal, expires_at)
+            self.started += 1
+            return True
+
+    def take(self, device_id, is_big_meal, now):
+        """Hand over the device's speculation (a Future) if it is still usable, else None"""
+        with self._lock:
+            speculation = self._pending.pop(device_id, None)
+            if speculation is None:
+                self.misses += 1
+                return None
+            if speculation.expires_at <= now or speculation.is_big_meal != is_big_meal:
+                self.wasted += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return speculation.future
+
+    def discard(self, device_id=None):
+        """Drop one device's speculation, or all of them (e.g. after a profile change)"""
+        with self._lock:
+            if device_id is None:
+                dropped, self._pending = len(self._pending), {}
+            else:
+                dropped = 1 if self._pending.pop(device_id, None) else 0
+            self.wasted += dropped
+
+    def expire(self, now):
+        """Drop speculations whose growl window has run out"""
+        with self._lock:
+            stale = [d for d, s in self._pending.items() if s.expires_at <= now]
+            for device_id in stale:
+                del self._pending[device_id]
+            self.wasted += len(stale)
+
+    def stats(self):
+        with self._lock:
+            triggers = self.hits + self.misses
+            return {
+                "started": self.started,
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / triggers, 3) if triggers else None,
+                "wasted": self.wasted,
+                "waste_rate": round(self.wasted / self.started, 3) if self.started else None,
+            }
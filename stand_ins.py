@@ -0,0 +1,209 @@
+"""
+Local stand-ins for the Anthropic API and the Selenium bots, used by the benchmarks
+so the server's own overhead can be measured without network calls or real browsers.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import types
+
+MIN_CACHEABLE_TOKENS = 1024    # shortest prompt prefix the API caches for Sonnet models
+
+MENU = [
+    ("Machali", "Fish Thali"),
+    ("Pabbas", "Gudbud"),
+    ("Ideal Ice Cream", "Gadbad"),
+    ("Giri Manja's", "Fish Curry Meal"),
+    ("Hotel Narayana", "Neer Dosa"),
+]
+
+
+class _TextBlock:
+    type = "text"
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _ToolUseBlock:
+    type = "tool_use"
+
+    def __init__(self, name, tool_input):
+        self.id = "toolu_stand_in"
+        self.name = name
+        self.input = tool_input
+
+
+class _Usage:
+    def __init__(self, input_tokens, output_tokens, cache_read=0, cache_creation=0):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cache_read_input_tokens = cache_read
+        self.cache_creation_input_tokens = cache_creation
+
+
+class _Message:
+    def __init__(self, text, usage=None):
+        self.content = [_TextBlock(text)]
+        self.usage = usage
+
+
+class FakeMessages:
+    def __init__(self, latency=0.5, jitter=0.2):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._counter = itertools.count()
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self._delay())
+        return self._respond(kwargs)
+
+    def _delay(self):
+        return max(0, random.gauss(self.latency, self.jitter * self.latency))
+
+    def _respond(self, kwargs):
+        prompt = str(kwargs.get("messages", [{}])[-1].get("content", ""))
+        # Like the real model, pick from the shortlist when the prompt offers one
+        options = [line[2:].split(" (")[0].split(" | ") for line in prompt.splitlines() if line.startswith("- ") and " | " in line]
+        menu = options or MENU
+        restaurant, dish = menu[next(self._counter) % len(menu)]
+        choice = {"restaurant": restaurant, "dish": dish, "rationale": "Stand-in"}
+
+        # The cached prefix is tools + system; like the API, ignore cache_control below the minimum length
+        prefix = json.dumps(kwargs.get("tools", "")) + json.dumps(kwargs.get("system", ""))
+        prefix_tokens = len(prefix) // 4
+        cacheable = "cache_control" in prefix and prefix_tokens >= MIN_CACHEABLE_TOKENS
+        with self._lock:
+            cached = cacheable and prefix in self._cached_prefixes
+            if cacheable:
+                self._cached_prefixes.add(prefix)
+        usage = _Usage(len(prompt) // 4 + (0 if cacheable else prefix_tokens), 60,
+                       cache_read=prefix_tokens if cached else 0,
+                       cache_creation=prefix_tokens if cacheable and not cached else 0)
+
+        tools = kwargs.get("tools")
+        if tools:
+            message = _Message("", usage)
+            message.content = [_ToolUseBlock(tools[0]["name"], choice)]
+            return message
+        return _Message(json.dumps(choice), usage)
+
+
+class FakeModels:
+    def list(self, **kwargs):
+        return []
+
+
+class FakeAnthropic:
+    """Drop-in for anthropic.Anthropic with a configurable response latency"""
+
+    def __init__(self, latency=0.5, jitter=0.2):
+        self.messages = FakeMessages(latency, jitter)
+        self.models = FakeModels()
+
+    def with_options(self, **options):
+        return self
+
+
+class FakeAsyncMessages(FakeMessages):
+    async def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self._delay())
+        return self._respond(kwargs)
+
+
+class FakeAsyncModels:
+    async def list(self, **kwargs):
+        return []
+
+
+class FakeAsyncAnthropic(FakeAnthropic):
+    """Drop-in for anthropic.AsyncAnthropic"""
+
+    def __init__(self, latency=0.5, jitter=0.2):
+        self.messages = FakeAsyncMessages(latency, jitter)
+        self.models = FakeAsyncModels()
+
+    async def close(self):
+        pass
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for BrowserPool's health check and reset"""
+
+    def __init__(self, launch_latency=0.0):
+        time.sleep(launch_latency)
+        self.window_handles = ["main"]
+        self.switch_to = types.SimpleNamespace(window=lambda handle: None)
+        self.current_url = "about:blank"
+
+    def execute_script(self, script, *args):
+        return 1
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        pass
+
+
+def make_fake_bot(platform, step_latency=0.2, success_rate=1.0, launch_latency=0.0):
+    """Build a class with the ZomatoAutomation/SwiggyAutomation interface that only sleeps"""
+
+    class FakeBot:
+        def __init__(self, headless=False, driver=None, lean=None, index=None):
+            self.driver = driver or self.create_driver(headless, lean)
+            self.cancelled = threading.Event()
+            self.ready = False
+
+        @staticmethod
+        def create_driver(headless=False, lean=False):
+            return FakeDriver(launch_latency)
+
+        def cancel(self):
+            self.cancelled.set()
+
+        def auto_order(self, restaurant_name, dish_name, phone_number, location="Mangaluru", on_stage=None, commit=True):
+            for stage in ("cart", "checkout"):
+                if self.cancelled.is_set():
+                    return False
+                if on_stage:
+                    on_stage(stage)
+                time.sleep(max(0, random.gauss(step_latency, step_latency * 0.2)))
+            self.ready = random.random() < success_rate
+            return self.ready and (self.commit_order() if commit else True)
+
+        def commit_order(self):
+            return self.ready
+
+    FakeBot.__name__ = f"Fake{platform.capitalize()}Automation"
+    return FakeBot
+
+
+def install(app_module, claude_latency=0.5, step_latency=0.2, success_rate=1.0, launch_latency=0.0):
+    """
+    Swap the stand-ins into a loaded app module: fake Claude client and fake bots for both
+    platforms (registered as zomato_automation / swiggy_automation). Real-order mode is the
+    caller's to set: ENABLE_REAL_ORDERS=true in the environment before importing app.
+    """
+    app_module.anthropic = FakeAnthropic(claude_latency)
+    for platform, module_name, class_name in (
+        ("zomato", "zomato_automation", "ZomatoAutomation"),
+        ("swiggy", "swiggy_automation", "SwiggyAutomation"),
+    ):
+        module = types.ModuleType(module_name)
+        setattr(module, class_name, make_fake_bot(platform, step_latency, success_rate, launch_latency))
+        sys.modules[module_name] = module
+    app_module.browser_pools.clear()
+    return app_module.anthropic
@@ -0,0 +1,101 @@
+"""
+Startup - cold-start bookkeeping for the order path.
+Expensive dependencies (the anthropic import + client, selenium and the bot modules, Chrome)
+are built on first use; each one's build time is recorded here. Warmup runs the registered
+steps in order on a background thread so they're built before the first order instead of
+during it, and ready() says whether every required step is hot (GET /ready).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+STARTED = time.perf_counter()   # app.py imports this module first, so this is when its import began
+
+
+class Startup:
+    def __init__(self):
+        self.steps = {}         # name -> (fn, check, required, enabled), in warmup order
+        self.timings = {}       # name -> seconds the first successful build took
+        self.errors = {}
+        self.import_seconds = None
+        self.warmup_seconds = None
+        self.state = "cold"     # cold -> warming -> warm
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def imported(self):
+        self.import_seconds = round(time.perf_counter() - STARTED, 3)
+
+    def step(self, name, fn, check=None, required=True, enabled=None):
+        """
+        fn: builds the dependency (must be safe to call again)
+        check: is it hot right now? (default: fn has succeeded once)
+        required: /ready waits for it; enabled: callable, a disabled step is skipped
+        Registering an existing name replaces that step in place.
+        """
+        self.steps[name] = (fn, check, required, enabled)
+
+    @contextmanager
+    def timed(self, name):
+        """Record how long building name took (the first successful build only)"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.errors[name] = str(e)
+            raise
+        with self._lock:
+            self.timings.setdefault(name, round(time.perf_counter() - start, 3))
+            self.errors.pop(name, None)
+
+    def warm(self):
+        """Run every enabled step once, in order; a failing step doesn't stop the rest"""
+        self.state = "warming"
+        start = time.perf_counter()
+        for name, (fn, check, required, enabled) in list(self.steps.items()):
+            if enabled and not enabled():
+                continue
+            try:
+                with self.timed(name):
+                    fn()
+            except Exception as e:
+                print(f"⚠️ Warmup step {name} failed: {e}")
+        self.warmup_seconds = round(time.perf_counter() - start, 3)
+        self.state = "warm"
+        print(f"🔥 Warmup finished in {self.warmup_seconds}s ({'ready' if self.ready() else 'not ready'})")
+
+    def start(self):
+        """warm() on a background thread, once"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self.warm, name="warmup", daemon=True)
+        self._thread.start()
+
+    def hot(self, name):
+        fn, check, required, enabled = self.steps[name]
+        return check() if check else name in self.timings
+
+    def ready(self):
+        return all(self.hot(name) for name, (fn, check, required, enabled) in list(self.steps.items())
+                   if required and (not enabled or enabled()))
+
+    def status(self):
+        steps = {}
+        for name, (fn, check, required, enabled) in list(self.steps.items()):
+            if enabled and not enabled():
+                steps[name] = {"skipped": True}
+                continue
+            steps[name] = {"hot": self.hot(name), "required": required, "seconds": self.timings.get(name)}
+            if name in self.errors:
+                steps[name]["error"] = self.errors[name]
+        return {
+            "ready": self.ready(),
+            "state": self.state,
+            "warmup_started": self._thread is not None,
+            "import_s": self.import_seconds,
+            "warmup_s": self.warmup_seconds,
+            "uptime_s": round(time.perf_counter() - STARTED, 1),
+            "steps": steps,
+        }
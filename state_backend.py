@@ -0,0 +1,358 @@
+"""
+State Backend - where growl windows, mute timers, per-device config overrides and the
+medical profile live.
+  memory - DeviceStore in this process (the default; lost on restart)
+  sqlite - one SQLite file in WAL mode, shared by every worker process and kept across
+           restarts. Growls from concurrent requests are group-committed: a writer thread
+           applies everything queued in one BEGIN IMMEDIATE transaction, which also
+           serializes the mute/trigger decision across processes.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+from device_state import DeviceStore, SEEN_EVENT_IDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    device_id TEXT PRIMARY KEY,
+    last_order_time REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS growls (
+    device_id TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS growls_device_ts ON growls (device_id, ts);
+CREATE TABLE IF NOT EXISTS seen_events (
+    device_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (device_id, event_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_events_device_seq ON seen_events (device_id, seq);
+CREATE TABLE IF NOT EXISTS profile (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS device_overrides (
+    device_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class _Op:
+    __slots__ = ("device_id", "events", "results", "error", "done")
+
+    def __init__(self, device_id, events):
+        self.device_id = device_id
+        self.events = events
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class SQLiteDeviceStore:
+    """DeviceStore with the same interface and rules, backed by a shared SQLite file"""
+
+    def __init__(self, path, window_size=120, min_growls=3, mute_duration=3600, clock=time.time, batch_size=256):
+        """
+        path: SQLite database file (shared by all worker processes)
+        batch_size: most queued requests applied in one transaction
+        """
+        self.path = path
+        self.window_size = window_size
+        self.min_growls = min_growls
+        self.mute_duration = mute_duration
+        self.clock = clock
+        self.batch_size = batch_size
+        self._ops = queue.Queue()
+        self._local = threading.local()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self.transactions = 0
+        self.ops = 0
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+    def _conn(self):
+        """Per-thread read connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def record_growl(self, device_id, now=None):
+        """Apply one growl (timestamped by the writer if now is None); same results as DeviceStore"""
+        return self._submit(device_id, [(None, now)])[0]
+
+    def record_batch(self, device_id, events):
+        """Apply many growls for one device in timestamp order within one transaction"""
+        return self._submit(device_id, sorted(events, key=lambda e: e[1]))
+
+    def _submit(self, device_id, events):
+        self._start_writer()
+        op = _Op(device_id, events)
+        self._ops.put(op)
+        op.done.wait()
+        if op.error is not None:
+            raise op.error
+        return op.results
+
+    def _start_writer(self):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="state-writer", daemon=True)
+                    self._writer.start()
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        while True:
+            ops = [self._ops.get()]
+            while len(ops) < self.batch_size:
+                try:
+                    ops.append(self._ops.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for op in ops:
+                    op.results = [self._apply(conn, op.device_id, event_id, ts) for event_id, ts in op.events]
+                conn.execute("COMMIT")
+                self.transactions += 1
+                self.ops += len(ops)
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                for op in ops:
+                    op.results, op.error = None, e
+            for op in ops:
+                op.done.set()
+
+    def _apply(self, conn, device_id, event_id, now):
+        """Window/mute/trigger logic for one growl inside the writer's transaction"""
+        if now is None:
+            now = self.clock()
+        if event_id is not None and self._already_seen(conn, device_id, event_id):
+            return {"status": "duplicate", "event_id": event_id}
+
+        conn.execute("INSERT OR IGNORE INTO devices (device_id) VALUES (?)", (device_id,))
+        last_order_time = conn.execute(
+            "SELECT last_order_time FROM devices WHERE device_id = ?", (device_id,)
+        ).fetchone()[0]
+        muted_until = last_order_time + self.mute_duration if last_order_time else 0
+        if now - last_order_time < self.mute_duration:
+            return {"status": "muted", "count": 0, "muted_until": muted_until, "event_id": event_id}
+
+        conn.execute("INSERT INTO growls (device_id, ts) VALUES (?, ?)", (device_id, now))
+        newest = conn.execute("SELECT MAX(ts) FROM growls WHERE device_id = ?", (device_id,)).fetchone()[0]
+        conn.execute("DELETE FROM growls WHERE device_id = ? AND ts <= ?", (device_id, newest - self.window_size))
+        count, oldest = conn.execute(
+            "SELECT COUNT(*), MIN(ts) FROM growls WHERE device_id = ?", (device_id,)
+        ).fetchone()
+
+        if count >= self.min_growls:
+            last_order_time = max(now, last_order_time)
+            conn.execute("UPDATE devices SET last_order_time = ? WHERE device_id = ?", (last_order_time, device_id))
+            conn.execute("DELETE FROM growls WHERE device_id = ?", (device_id,))
+            return {"status": "triggered", "count": count,
+                    "muted_until": last_order_time + self.mute_duration, "event_id": event_id}
+
+        return {"status": "monitoring", "count": count, "window_expires_at": oldest + self.window_size,
+                "event_id": event_id}
+
+    def _already_seen(self, conn, device_id, event_id):
+        """Remember event_id (last SEEN_EVENT_IDS per device); True if it was applied before"""
+        if conn.execute("SELECT 1 FROM seen_events WHERE device_id = ? AND event_id = ?",
+                        (device_id, event_id)).fetchone():
+            return True
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM seen_events WHERE device_id = ?",
+                           (device_id,)).fetchone()[0]
+        conn.execute("INSERT INTO seen_events (device_id, event_id, seq) VALUES (?, ?, ?)", (device_id, event_id, seq))
+        conn.execute("DELETE FROM seen_events WHERE device_id = ? AND seq <= ?", (device_id, seq - SEEN_EVENT_IDS))
+        return False
+
+    def snapshot(self, device_id):
+        """Current window size and mute state for one device"""
+        conn = self._conn()
+        now = self.clock()
+        row = conn.execute("SELECT last_order_time FROM devices WHERE device_id = ?", (device_id,)).fetchone()
+        last_order_time = row[0] if row else 0
+        count = conn.execute("SELECT COUNT(*) FROM growls WHERE device_id = ? AND ts > ?",
+                             (device_id, now - self.window_size)).fetchone()[0]
+        muted_until = last_order_time + self.mute_duration if last_order_time else 0
+        return {
+            "device_id": device_id,
+            "count": count,
+            "muted": now < muted_until,
+            "muted_until": muted_until,
+        }
+
+    def device_ids(self):
+        return [row[0] for row in self._conn().execute("SELECT device_id FROM devices")]
+
+    def stats(self):
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "transactions": self.transactions,
+            "ops": self.ops,
+            "ops_per_transaction": round(self.ops / self.transactions, 2) if self.transactions else None,
+            "queued": self._ops.qsize(),
+        }
+
+
+class MemoryProfileStore:
+    """Profile lives only in the process (the original behaviour)"""
+
+    def load(self):
+        return None
+
+    def save(self, profile):
+        pass
+
+    def changed(self):
+        return None
+
+
+class SQLiteProfileStore:
+    """Medical profile kept in the state database; workers pick up each other's /setup changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = 0
+        self._local = threading.local()
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def load(self):
+        row = self._conn().execute("SELECT data, version FROM profile WHERE id = 1").fetchone()
+        if row is None:
+            return None
+        self.version = row[1]
+        return json.loads(row[0])
+
+    def save(self, profile):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO profile (id, data, version) VALUES (1, ?, 1) "
+                "ON CONFLICT (id) DO UPDATE SET data = excluded.data, version = profile.version + 1",
+                (json.dumps(profile),)
+            )
+            self.version = conn.execute("SELECT version FROM profile WHERE id = 1").fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def changed(self):
+        """The stored profile if another process saved a newer one since we last looked, else None"""
+        row = self._conn().execute("SELECT version FROM profile WHERE id = 1").fetchone()
+        if row is None or row[0] == self.version:
+            return None
+        return self.load()
+
+
+def _merge(overrides, updates):
+    for name, value in updates.items():
+        if value is None:
+            overrides.pop(name, None)
+        else:
+            overrides[name] = value
+    return overrides
+
+
+class MemoryOverrideStore:
+    """Per-device config overrides in this process only"""
+
+    def __init__(self):
+        self._overrides = {}
+        self._lock = threading.Lock()
+
+    def load(self, device_id):
+        with self._lock:
+            return dict(self._overrides.get(device_id, {}))
+
+    def update(self, device_id, updates):
+        """Apply {tunable: value} (None drops it) -> the device's overrides after the change"""
+        with self._lock:
+            return dict(_merge(self._overrides.setdefault(device_id, {}), updates))
+
+    def all(self):
+        with self._lock:
+            return {device_id: dict(values) for device_id, values in self._overrides.items() if values}
+
+
+class SQLiteOverrideStore:
+    """Per-device config overrides in the state database: kept across restarts, seen by every worker"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def load(self, device_id):
+        row = self._conn().execute("SELECT data FROM device_overrides WHERE device_id = ?", (device_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def update(self, device_id, updates):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")     # read-modify-write: concurrent PUTs from other workers wait
+        try:
+            overrides = _merge(self.load(device_id), updates)
+            conn.execute(
+                "INSERT INTO device_overrides (device_id, data, version) VALUES (?, ?, 1) "
+                "ON CONFLICT (device_id) DO UPDATE SET data = excluded.data, version = device_overrides.version + 1",
+                (device_id, json.dumps(overrides))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return overrides
+
+    def all(self):
+        rows = self._conn().execute("SELECT device_id, data FROM device_overrides")
+        return {device_id: values for device_id, values in ((d, json.loads(data)) for d, data in rows) if values}
+
+
+def open_state(backend, path, window_size, min_growls, mute_duration):
+    """Return (device_store, profile_store, override_store) for STATE_BACKEND"""
+    if backend == "sqlite":
+        return (SQLiteDeviceStore(path, window_size, min_growls, mute_duration),
+                SQLiteProfileStore(path), SQLiteOverrideStore(path))
+    if backend != "memory":
+        print(f"⚠️ Unknown STATE_BACKEND '{backend}', keeping state in memory")
+    return DeviceStore(window_size, min_growls, mute_duration), MemoryProfileStore(), MemoryOverrideStore()
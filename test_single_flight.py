@@ -0,0 +1,134 @@
+"""
+Concurrency stress test for order-trigger coalescing.
+Many belts cross the growl threshold at the same instant; exactly one Claude call and
+one order must come out, and every trigger must get that order's id.
+Runs in-process with the stand-ins (no server, API key or browser needed):
+  python test_single_flight.py      or      python -m pytest test_single_flight.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+os.environ["ENABLE_REAL_ORDERS"] = "false"
+os.environ["SPECULATIVE_PREFETCH"] = "false"
+
+import app as server
+import stand_ins
+from single_flight import SingleFlight
+
+THREADS = 64
+
+
+def run_together(fn, count=THREADS):
+    """Call fn(i) on `count` threads released at the same moment; returns results by index"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn(i)
+        except Exception as e:
+            errors.append(e)
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_single_flight_runs_once():
+    """Concurrent callers for one key share a single call and its result"""
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = run_together(lambda i: flights.do("key", slow))
+    assert not errors
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats() == {"calls": 1, "shared": THREADS - 1, "in_flight": 0}
+
+
+def test_single_flight_shares_errors():
+    """A failing call fails every caller that joined it, and the next call runs fresh"""
+    flights = SingleFlight()
+
+    def boom():
+        time.sleep(0.2)
+        raise RuntimeError("API down")
+
+    results, errors = run_together(lambda i: flights.do("key", boom), count=16)
+    assert len(errors) == 16 and all(isinstance(e, RuntimeError) for e in errors)
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_concurrent_triggers_place_one_order():
+    """Belts crossing the threshold together -> one recommendation, one order, one shared order_id"""
+    # Everything changed here is put back afterwards so later tests see the real app
+    saved = {name: getattr(server, name) for name in ("anthropic", "MENU_MODE", "ORDER_COALESCE", "place_zomato_order")}
+    saved_modules = {name: sys.modules.get(name) for name in ("zomato_automation", "swiggy_automation")}
+    fake = stand_ins.install(server, claude_latency=0.3)
+    server.recommendation_cache.invalidate()
+    server.MENU_MODE = "claude"
+    server.ORDER_COALESCE = "user"
+    placed = []
+    real_place = server.place_zomato_order
+
+    def counting_place(order_details, on_stage=None):
+        placed.append(order_details)
+        time.sleep(0.3)
+        return real_place(order_details, on_stage)
+
+    server.place_zomato_order = counting_place
+    try:
+        client = server.app.test_client()
+        devices = [f"stress-{i}" for i in range(THREADS)]
+        for device_id in devices:
+            for _ in range(server.MIN_GROWLS_FOR_ORDER - 1):
+                client.post("/detect", json={"device_id": device_id})
+
+        calls_before = fake.messages.calls
+        results, errors = run_together(
+            lambda i: server.app.test_client().post("/detect", json={"device_id": devices[i]}).get_json()
+        )
+        assert not errors
+        assert all(r["status"] == "accepted" for r in results)
+        order_ids = {r["order_id"] for r in results}
+        assert len(order_ids) == 1
+
+        job = server.order_queue.get(order_ids.pop())
+        deadline = time.time() + 30
+        while job.status not in ("completed", "failed") and time.time() < deadline:
+            time.sleep(0.05)
+        assert job.status == "completed"
+        assert job.triggers == THREADS
+        assert len(placed) == 1
+        assert fake.messages.calls - calls_before == 1
+    finally:
+        for name, value in saved.items():
+            setattr(server, name, value)
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        server.browser_pools.clear()
+        server.recommendation_cache.invalidate()
+
+
+if __name__ == "__main__":
+    for test in (test_single_flight_runs_once, test_single_flight_shares_errors, test_concurrent_triggers_place_one_order):
+        print(f"🔁 {test.__name__}...")
+        test()
+        print("✅ passed")
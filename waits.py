@@ -0,0 +1,97 @@
+"""
+Adaptive Waits - wait on real page readiness (DOM quiet, no pending fetch/XHR) instead
+of fixed time.sleep calls, with a time budget per step and one overall deadline per order.
+Waiting for a particular element (and for result lists to settle) is PlatformDriver.wait_for.
+"""
+
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Max seconds each automation step may take (also capped by the order deadline)
+STEP_BUDGETS = {
+    "login": 20,
+    "location": 10,
+    "search": 10,
+    "restaurant": 15,
+    "add_to_cart": 10,
+    "cart": 10,
+    "checkout": 15,
+}
+ORDER_DEADLINE = float(os.getenv("ORDER_DEADLINE", "90"))
+POLL_INTERVAL = 0.1
+
+# Installs (once per page) a MutationObserver and fetch/XHR counters, then reports readiness
+_READINESS_JS = """
+var w = window;
+if (!w.__momReady) {
+    w.__momReady = {pending: 0, lastMutation: performance.now()};
+    new MutationObserver(function () { w.__momReady.lastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true});
+    var done = function () { w.__momReady.pending = Math.max(0, w.__momReady.pending - 1); };
+    if (w.fetch) {
+        var origFetch = w.fetch;
+        w.fetch = function () {
+            w.__momReady.pending++;
+            return origFetch.apply(this, arguments).finally(done);
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        w.__momReady.pending++;
+        this.addEventListener('loadend', done);
+        return origSend.apply(this, arguments);
+    };
+}
+return {
+    state: document.readyState,
+    pending: w.__momReady.pending,
+    quietMs: performance.now() - w.__momReady.lastMutation
+};
+"""
+
+
+class OrderCancelled(Exception):
+    pass
+
+
+class OrderDeadline:
+    def __init__(self, total_seconds=ORDER_DEADLINE, cancelled=None):
+        """cancelled: optional threading.Event; once set every budget() call raises OrderCancelled"""
+        self.total = total_seconds
+        self.started = time.time()
+        self.cancelled = cancelled
+
+    def remaining(self):
+        return self.total - (time.time() - self.started)
+
+    def budget(self, step):
+        """Seconds available for a step: its own budget, capped by what is left overall"""
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise OrderCancelled(f"Order cancelled before '{step}'")
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise TimeoutError(f"Order deadline of {self.total:.0f}s exceeded before '{step}'")
+        return min(STEP_BUDGETS.get(step, 10), remaining)
+
+
+def page_ready(driver, quiet_ms=300):
+    """True once the document is loaded, no fetch/XHR is in flight and the DOM has been quiet"""
+    try:
+        info = driver.execute_script(_READINESS_JS)
+    except Exception:
+        return False
+    return info["state"] == "complete" and info["pending"] == 0 and info["quietMs"] >= quiet_ms
+
+
+def wait_for_page_ready(driver, timeout, quiet_ms=300):
+    """Wait until page_ready(); returns False on timeout (the next element wait decides)"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            lambda d: page_ready(d, quiet_ms)
+        )
+        return True
+    except TimeoutException:
+        return False